@@ -1,12 +1,16 @@
-from flask import Flask, render_template, jsonify
-import pandas as pd
+from flask import Flask, render_template, jsonify, Response, request, make_response
+import csv
+import gzip
+import hashlib
 from datetime import datetime
 import os
 import subprocess
-from threading import Thread, Lock
+import time
+from threading import Lock
 from flask_cors import CORS  # Import CORS
-import numpy as np
-import json
+import orjson
+from watchdog.observers import Observer
+from watchdog.events import FileSystemEventHandler
 
 try:
     from PyPDF2 import PdfReader
@@ -14,76 +18,189 @@ except ImportError:
     print("PyPDF2 module not found. Please install it with: pip install PyPDF2")
     PdfReader = None  # Define as None to prevent errors if import fails
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # No flock on Windows; fall back to tracking the pipeline in this process only
+
 # Initialize Flask app
 app = Flask(__name__)
 
+# Frontend domains allowed to call the API
+ALLOWED_ORIGINS = [
+    "https://jsw-scrapped-data-frontend.vercel.app",
+    "http://localhost:3000", 
+    "http://localhost:3001", 
+    "http://127.0.0.1:3000",
+    "http://192.168.1.210:3000"
+]
+
 # Configure CORS to allow requests from frontend domains
 CORS(app, resources={
     r"/api/*": {
-        "origins": [
-            "https://jsw-scrapped-data-frontend.vercel.app",
-            "http://localhost:3000", 
-                 "http://localhost:3001", 
-            "http://127.0.0.1:3000",
-            "http://192.168.1.210:3000"
-        ],
+        "origins": ALLOWED_ORIGINS,
         "methods": ["GET", "POST", "OPTIONS"],
-        "allow_headers": ["Content-Type", "Authorization"]
+        "allow_headers": ["Content-Type", "Authorization"],
+        "max_age": 86400  # Let browsers cache preflight responses for a day
     }
 })
 
+@app.before_request
+def short_circuit_options():
+    """Answer API preflight requests before routing reaches any handler"""
+    if request.method == 'OPTIONS' and request.path.startswith('/api/'):
+        resp = make_response('', 204)
+        origin = request.headers.get('Origin')
+        if origin in ALLOWED_ORIGINS:
+            resp.headers['Access-Control-Allow-Origin'] = origin
+            resp.headers['Access-Control-Allow-Methods'] = 'GET, POST, OPTIONS'
+            resp.headers['Access-Control-Allow-Headers'] = 'Content-Type, Authorization'
+            resp.headers['Access-Control-Max-Age'] = '86400'
+        resp.headers['Vary'] = 'Origin'
+        return resp
+
 # Add these global variables after the imports
 CSV_FILE = "qualified_news.csv"
-last_modified_time = 0
+csv_dirty = True  # Set by the file watcher whenever the CSV changes on disk
 cached_projects = []
-pipeline_running = False
+cached_json_blob = b"[]"
+cached_json_gzip = gzip.compress(cached_json_blob)
+cached_etag = hashlib.sha1(cached_json_blob).hexdigest()
+cache_lock = Lock()  # Serializes reloads and keeps the cached blob, gzip body and ETag consistent
+PIPELINE_PID_FILE = "pipeline.pid"  # Held under an exclusive flock by the running pipeline
+PIPELINE_LOCK_ATTEMPTS = 5  # Tries at the PID file lock before a start is refused
+PIPELINE_LOCK_RETRY_DELAY = 0.05  # Seconds between those tries
+pipeline_proc = None  # subprocess.Popen handle for a pipeline started by this process, if any
 pipeline_lock = Lock()
 
+class CSVChangeHandler(FileSystemEventHandler):
+    """Mark the project cache stale when the CSV file is written, replaced or removed"""
+    def __init__(self):
+        super().__init__()
+        self.csv_path = os.path.abspath(CSV_FILE)
+
+    def on_any_event(self, event):
+        global csv_dirty
+        paths = (event.src_path, getattr(event, 'dest_path', ''))
+        if any(path and os.path.abspath(path) == self.csv_path for path in paths):
+            csv_dirty = True
+
+def start_csv_watcher():
+    """Watch the CSV directory so requests don't need to stat the file"""
+    observer = Observer()
+    observer.schedule(CSVChangeHandler(), path=os.path.dirname(os.path.abspath(CSV_FILE)), recursive=False)
+    observer.daemon = True
+    observer.start()
+    return observer
+
+csv_observer = start_csv_watcher()
+
 def load_projects_from_csv():
     """Load projects from CSV file with caching"""
-    global last_modified_time, cached_projects
+    global csv_dirty, cached_projects, cached_json_blob, cached_json_gzip, cached_etag
     
-    try:
-        # Check if file exists
-        if not os.path.exists(CSV_FILE):
-            return []
-            
-        # Get current file modification time
-        current_mtime = os.path.getmtime(CSV_FILE)
-        
-        # If file hasn't changed and we have cached data, return cached data
-        if current_mtime == last_modified_time and cached_projects:
+    # If file hasn't changed and we have cached data, return cached data
+    if not csv_dirty and cached_projects:
+        return cached_projects
+    
+    with cache_lock:
+        # Another thread may have reloaded the CSV while we waited for the lock
+        if not csv_dirty and cached_projects:
             return cached_projects
-            
-        # Read CSV file with specific column names
-        df = pd.read_csv(CSV_FILE)
         
-        # Convert DataFrame to list of dictionaries
-        projects = df.to_dict('records')
-        
-        # Update cache
-        last_modified_time = current_mtime
-        cached_projects = projects
-        
-        return projects
-    except Exception as e:
-        print(f"Error loading projects from CSV: {e}")
-        return []
+        # Clear the flag before reading so a write during the read is picked up next time
+        csv_dirty = False
+        try:
+            # Check if file exists
+            if not os.path.exists(CSV_FILE):
+                csv_dirty = True
+                return []
+                
+            # Read CSV rows straight into a list of dictionaries, with empty cells as None
+            with open(CSV_FILE, newline='', encoding='utf-8') as f:
+                projects = [
+                    {key: (value if value != '' else None) for key, value in row.items()}
+                    for row in csv.DictReader(f)
+                ]
+            
+            # Serialize once per CSV change
+            json_blob = orjson.dumps(projects)
+            
+            # Update cache, including a pre-compressed body and a content-derived ETag
+            cached_projects = projects
+            cached_json_blob = json_blob
+            cached_json_gzip = gzip.compress(json_blob)
+            cached_etag = hashlib.sha1(json_blob).hexdigest()
+            
+            return projects
+        except Exception as e:
+            csv_dirty = True
+            print(f"Error loading projects from CSV: {e}")
+            return []
 
-def run_pipeline_async():
-    """Run the deepseek pipeline in a separate process"""
-    global pipeline_running
+def reap_pipeline_proc():
+    """Reap a pipeline child started by this process once it has exited"""
+    global pipeline_proc
+    with pipeline_lock:
+        if pipeline_proc is None:
+            return False
+        returncode = pipeline_proc.poll()
+        if returncode is None:
+            return True
+        if returncode != 0:
+            print(f"Pipeline execution failed with exit code {returncode}")
+        pipeline_proc = None
+        return False
+
+def is_pipeline_running():
+    """Check the PID file lock, which is shared by every server process"""
+    local_running = reap_pipeline_proc()
+    if fcntl is None:
+        return local_running
+    
+    # A shared probe only conflicts with the pipeline's exclusive lock, not with other status checks
+    fd = os.open(PIPELINE_PID_FILE, os.O_RDWR | os.O_CREAT, 0o644)
     try:
-        with pipeline_lock:
-            pipeline_running = True
-        subprocess.run(['python', 'deepseek_pipeline.py'], check=True)
-    except subprocess.CalledProcessError as e:
-        print(f"Pipeline execution failed: {e}")
-    except Exception as e:
-        print(f"Error running pipeline: {e}")
+        fcntl.flock(fd, fcntl.LOCK_SH | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return True
     finally:
+        # Closing the descriptor also drops the probe lock if we acquired it
+        os.close(fd)
+    return False
+
+def start_pipeline_locked():
+    """Start the pipeline if no other process holds the PID file lock; return whether it started"""
+    global pipeline_proc
+    if fcntl is None:
         with pipeline_lock:
-            pipeline_running = False
+            if pipeline_proc is not None:
+                return False
+            pipeline_proc = subprocess.Popen(['python', 'deepseek_pipeline.py'])
+        return True
+    
+    fd = os.open(PIPELINE_PID_FILE, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        # A status check holds its shared probe lock only briefly, so retry before
+        # reporting that another pipeline holds the lock
+        for attempt in range(PIPELINE_LOCK_ATTEMPTS):
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if attempt == PIPELINE_LOCK_ATTEMPTS - 1:
+                    return False
+                time.sleep(PIPELINE_LOCK_RETRY_DELAY)
+        
+        # The child inherits the locked descriptor, so the lock lives exactly as long as the pipeline
+        proc = subprocess.Popen(['python', 'deepseek_pipeline.py'], pass_fds=(fd,))
+        os.ftruncate(fd, 0)
+        os.write(fd, f"{proc.pid}\n".encode())
+        with pipeline_lock:
+            pipeline_proc = proc
+        return True
+    finally:
+        os.close(fd)
 
 @app.route('/')
 def index():
@@ -95,21 +212,27 @@ def index():
 @app.route('/api/projects')
 def get_projects():
     """API endpoint to get all projects"""
-    class NaNHandler(json.JSONEncoder):
-        def default(self, obj):
-            if isinstance(obj, float) and np.isnan(obj):
-                return None
-            return super().default(obj)
-    
     projects = load_projects_from_csv()
+    if not projects:
+        return Response(b"[]", mimetype='application/json')
+    
+    # Take a consistent snapshot of the cached representations
+    with cache_lock:
+        json_blob, json_gzip, etag = cached_json_blob, cached_json_gzip, cached_etag
     
-    # Convert NaN values to null
-    for project in projects:
-        for key, value in project.items():
-            if isinstance(value, float) and np.isnan(value):
-                project[key] = None
+    # Serve the bytes serialized when the CSV was last loaded, gzipped if the client accepts it
+    if 'gzip' in request.accept_encodings:
+        resp = Response(json_gzip, mimetype='application/json')
+        resp.headers['Content-Encoding'] = 'gzip'
+        resp.set_etag(f"{etag}-gzip")
+    else:
+        resp = Response(json_blob, mimetype='application/json')
+        resp.set_etag(etag)
+    resp.vary.add('Accept-Encoding')
+    resp.headers['Cache-Control'] = 'public, max-age=5'
     
-    return jsonify(projects)
+    # Dashboard polls with an unchanged ETag get an empty 304
+    return resp.make_conditional(request)
 
 @app.route('/api/projects/<int:project_id>')
 def get_project(project_id):
@@ -122,29 +245,21 @@ def get_project(project_id):
 @app.route('/api/run_pipeline', methods=['POST'])
 def run_pipeline():
     """API endpoint to start the pipeline"""
-    global pipeline_running
     try:
-        with pipeline_lock:
-            if pipeline_running:
-                return jsonify({"status": "error", "message": "Pipeline is already running"}), 400
-            pipeline_running = True
-        
-        # Start the pipeline in a separate thread
-        thread = Thread(target=run_pipeline_async)
-        thread.daemon = True
-        thread.start()
+        # Reap a finished child first so its exit is logged before starting another run
+        reap_pipeline_proc()
+        if not start_pipeline_locked():
+            return jsonify({"status": "error", "message": "Pipeline is already running"}), 400
         return jsonify({"status": "success", "message": "Pipeline started successfully"})
     except Exception as e:
-        with pipeline_lock:
-            pipeline_running = False
         return jsonify({"status": "error", "message": str(e)}), 500
 
 @app.route('/api/pipeline_status')
 def get_pipeline_status():
     """API endpoint to check pipeline status"""
-    with pipeline_lock:
-        return jsonify({"running": pipeline_running})
+    return jsonify({"running": is_pipeline_running()})
 
 if __name__ == '__main__':
+    # Local development only; production runs under Gunicorn (see gunicorn_config.py)
     port = int(os.environ.get('PORT', 5000))  # Default to 5000 if PORT is not set
-    app.run(host='0.0.0.0', port=port, debug=True) 
\ No newline at end of file
+    app.run(host='0.0.0.0', port=port, threaded=True) 
\ No newline at end of file
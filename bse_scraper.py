@@ -1,17 +1,21 @@
 """BSE announcement scraper module focusing on steel and infrastructure announcements."""
 
-from typing import List, Dict, Any
-import requests
+from typing import List, Dict, Any, Optional, Tuple
+import asyncio
+import aiohttp
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 import logging
-from pydantic import BaseModel, Field
-import time
-import json
+import random
+import orjson
+import hashlib
 import os
 import re
-import io
-import PyPDF2
+import pypdfium2 as pdfium
+# Shared with bse_scraper2, which can be parsing PDFs in the same process
+from pdfium_lock import PDFIUM_LOCK
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
 
 # Configure logging
 logging.basicConfig(
@@ -180,6 +184,69 @@ PROJECT_TYPE_MAPPING = {
     'order': 'Order/Contract'
 }
 
+# Keywords ordered longest first (ties keep mapping order) so the most specific
+# keyword wins, matching the original sort-by-length behaviour
+PROJECT_KEYWORD_RANK = {
+    keyword: rank
+    for rank, keyword in enumerate(sorted(PROJECT_TYPE_MAPPING, key=len, reverse=True))
+}
+
+# Rank and project type for each keyword, looked up once per regex hit
+PROJECT_KEYWORD_PAYLOADS = {
+    keyword: (rank, PROJECT_TYPE_MAPPING[keyword])
+    for keyword, rank in PROJECT_KEYWORD_RANK.items()
+}
+
+# Combined pattern for all project type keywords; the lookahead keeps overlapping
+# keywords (e.g. 'hydropower' and 'power plant') visible to a single finditer pass
+PROJECT_TYPE_PATTERN = re.compile(
+    '(?=(' + '|'.join(re.escape(keyword) for keyword in PROJECT_KEYWORD_RANK) + '))'
+)
+
+# Project-related keywords to filter announcements
+PROJECT_KEYWORDS = [
+    'project', 'contract', 'order', 'steel', 'infrastructure',
+    'awarded', 'wins', 'secured', 'bags', 'development', 'execution',
+    'tender', 'bid', 'loa', 'letter of award', 'work order',
+    'construction', 'metro', 'railway', 'road', 'highway', 'bridge'
+]
+
+# Maximum number of in-flight requests per host; the BSE API is kept lower to avoid rate limiting
+HOST_CONCURRENCY = {'api.bseindia.com': 4}
+DEFAULT_HOST_CONCURRENCY = 8
+
+# Retry transient failures with exponential backoff
+RETRY_ATTEMPTS = 3
+RETRY_BACKOFF = 0.3
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# BSE API headers
+BSE_HEADERS = {
+    'authority': 'api.bseindia.com',
+    'accept': 'application/json, text/plain, */*',
+    'accept-language': 'en-US,en;q=0.9',
+    'origin': 'https://www.bseindia.com',
+    'referer': 'https://www.bseindia.com/',
+    'sec-ch-ua': '"Not A(Brand";v="99", "Google Chrome";v="121", "Chromium";v="121"',
+    'sec-ch-ua-mobile': '?0',
+    'sec-ch-ua-platform': '"Windows"',
+    'sec-fetch-dest': 'empty',
+    'sec-fetch-mode': 'cors',
+    'sec-fetch-site': 'same-site',
+    'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'
+}
+
+# Total connection pool shared by API calls and PDF downloads
+MAX_CONNECTIONS = 32
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=30)
+
+# Extracted PDF text is cached here so repeat runs skip the download and parse
+PDF_CACHE_DIR = os.path.join('.cache', 'bse_pdfs')
+
+# PDFium is not thread-safe, so PDFs are parsed on a single dedicated thread rather
+# than on the loop's default executor, and under the lock shared with bse_scraper2
+PDF_PARSE_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdfium")
+
 # List of Indian states and major cities for location detection
 INDIAN_LOCATIONS = [
     'andhra pradesh', 'arunachal pradesh', 'assam', 'bihar', 'chhattisgarh', 'goa', 'gujarat', 
@@ -195,78 +262,68 @@ INDIAN_LOCATIONS = [
     'rajkot', 'kalyan', 'vasai', 'varanasi', 'srinagar', 'ghaziabad', 'amritsar', 'raipur'
 ]
 
-class BSEAnnouncement(BaseModel):
-    """Model for BSE announcements"""
-    title: str
-    date: datetime
-    company: str
-    symbol: str
-    scrip_code: str
-    category: str = Field(default="")
-    attachment_url: str = Field(default="")
-    xbrl_url: str = Field(default="")
-    pdf_content: str = Field(default="")
-    project_type: str = Field(default="")
-    location: str = Field(default="")
-    contract_value: str = Field(default="")
-    description: str = Field(default="")
+# Location priority follows list order (states before cities)
+LOCATION_RANK = {location: rank for rank, location in enumerate(dict.fromkeys(INDIAN_LOCATIONS))}
 
-def extract_project_type(text: str) -> str:
-    """Extract project type from text."""
-    text_lower = text.lower()
-    
-    # Find all matching keywords
-    matches = []
-    for keyword, project_type in PROJECT_TYPE_MAPPING.items():
-        if keyword.lower() in text_lower:
-            matches.append((keyword, project_type))
-    
-    # Sort by keyword length (longer matches are more specific)
-    matches.sort(key=lambda x: len(x[0]), reverse=True)
-    
-    # Return the most specific match, or a default
-    if matches:
-        return matches[0][1]
-    return "Infrastructure Project"
+# Combined pattern for all locations, scanned once per text; alternation follows
+# LOCATION_RANK so each position reports its highest priority location
+LOCATION_PATTERN = re.compile(
+    '(?=(' + '|'.join(re.escape(location) for location in LOCATION_RANK) + '))'
+)
 
-def extract_location(text: str) -> str:
-    """Extract location information from text."""
-    text_lower = text.lower()
-    
-    # Check for Indian locations
-    for location in INDIAN_LOCATIONS:
-        if location in text_lower:
-            # Capitalize properly
-            return location.title()
+# Fallback "in [Location]" pattern for places not in INDIAN_LOCATIONS
+LOCATION_FALLBACK_PATTERN = re.compile(r'in\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)')
+
+# Contract value patterns, matched against lowercased text
+# INR/Rs patterns
+INR_PATTERN = re.compile(r'(?:rs\.?|inr|₹)\s*(\d+(?:,\d+)*(?:\.\d+)?)\s*(?:crore|cr\.?|lakh|lac|million|mn|billion|bn)')
+
+# USD patterns
+USD_PATTERN = re.compile(r'(?:usd|\$)\s*(\d+(?:,\d+)*(?:\.\d+)?)\s*(?:million|mn|billion|bn)')
+
+# Value with units
+VALUE_PATTERN = re.compile(r'(\d+(?:,\d+)*(?:\.\d+)?)\s*(?:crore|cr\.?|lakh|lac|million|mn|billion|bn|mw|gw|mwp)')
+
+# Combined pattern for "value of" expressions
+VALUE_OF_PATTERN = re.compile(r'(?:value|worth|amount|order value|contract value|size) of (?:rs\.?|inr|₹|usd|\$)?\s*(\d+(?:,\d+)*(?:\.\d+)?)\s*(?:crore|cr\.?|lakh|lac|million|mn|billion|bn)')
+
+def _project_type_from_lower(text_lower: str) -> str:
+    """Extract project type from already lowercased text."""
+    # Single pass over the text keeping only the most specific (longest) keyword seen so far
+    best_rank = len(PROJECT_KEYWORD_PAYLOADS)
+    best_type = "Infrastructure Project"
+    for match in PROJECT_TYPE_PATTERN.finditer(text_lower):
+        rank, project_type = PROJECT_KEYWORD_PAYLOADS[match.group(1)]
+        if rank < best_rank:
+            best_rank = rank
+            best_type = project_type
+            # Nothing can beat the longest keyword
+            if rank == 0:
+                break
+    return best_type
+
+def _location_from_lower(text_lower: str, text: str) -> str:
+    """Extract location from lowercased text, falling back to the original casing."""
+    # Check for Indian locations, preferring the earliest entry in INDIAN_LOCATIONS
+    locations = [match.group(1) for match in LOCATION_PATTERN.finditer(text_lower)]
+    if locations:
+        # Capitalize properly
+        return min(locations, key=LOCATION_RANK.__getitem__).title()
     
     # Look for "in [location]" pattern
-    location_pattern = r'in\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)'
-    matches = re.findall(location_pattern, text)
-    if matches:
-        return matches[0]
+    match = LOCATION_FALLBACK_PATTERN.search(text)
+    if match:
+        return match.group(1)
     
     return ""
 
-def extract_contract_value(text: str) -> str:
-    """Extract contract value from text."""
-    text_lower = text.lower()
-    
+def _contract_value_from_lower(text_lower: str) -> str:
+    """Extract contract value from already lowercased text."""
     # Look for currency patterns
-    # INR/Rs patterns
-    inr_pattern = r'(?:rs\.?|inr|₹)\s*(\d+(?:,\d+)*(?:\.\d+)?)\s*(?:crore|cr\.?|lakh|lac|million|mn|billion|bn)'
-    inr_matches = re.findall(inr_pattern, text_lower)
-    
-    # USD patterns
-    usd_pattern = r'(?:usd|\$)\s*(\d+(?:,\d+)*(?:\.\d+)?)\s*(?:million|mn|billion|bn)'
-    usd_matches = re.findall(usd_pattern, text_lower)
-    
-    # Value with units
-    value_pattern = r'(\d+(?:,\d+)*(?:\.\d+)?)\s*(?:crore|cr\.?|lakh|lac|million|mn|billion|bn|mw|gw|mwp)'
-    value_matches = re.findall(value_pattern, text_lower)
-    
-    # Combined pattern for "value of" expressions
-    value_of_pattern = r'(?:value|worth|amount|order value|contract value|size) of (?:rs\.?|inr|₹|usd|\$)?\s*(\d+(?:,\d+)*(?:\.\d+)?)\s*(?:crore|cr\.?|lakh|lac|million|mn|billion|bn)'
-    value_of_matches = re.findall(value_of_pattern, text_lower)
+    inr_matches = INR_PATTERN.findall(text_lower)
+    usd_matches = USD_PATTERN.findall(text_lower)
+    value_matches = VALUE_PATTERN.findall(text_lower)
+    value_of_matches = VALUE_OF_PATTERN.findall(text_lower)
     
     # Combine all matches
     all_matches = []
@@ -291,195 +348,313 @@ def extract_contract_value(text: str) -> str:
     
     return all_matches[0] if all_matches else ""
 
-def scrape_bse_announcements() -> List[Dict[str, Any]]:
-    """Scrape steel and infrastructure related announcements from BSE company pages."""
+def extract_project_type(text: str) -> str:
+    """Extract project type from text."""
+    return _project_type_from_lower(text.lower())
+
+def extract_location(text: str) -> str:
+    """Extract location information from text."""
+    return _location_from_lower(text.lower(), text)
+
+def extract_contract_value(text: str) -> str:
+    """Extract contract value from text."""
+    return _contract_value_from_lower(text.lower())
+
+def extract_all(text: str) -> Tuple[str, str, str]:
+    """Extract project type, location and contract value from text in one pass."""
+    text_lower = text.lower()
+    return (
+        _project_type_from_lower(text_lower),
+        _location_from_lower(text_lower, text),
+        _contract_value_from_lower(text_lower),
+    )
+
+def _host_semaphore(semaphores: Dict[str, asyncio.Semaphore], url: str) -> asyncio.Semaphore:
+    """Return the concurrency limiter for a URL's host, creating it on first use."""
+    host = urlsplit(url).hostname or ''
+    if host not in semaphores:
+        semaphores[host] = asyncio.Semaphore(HOST_CONCURRENCY.get(host, DEFAULT_HOST_CONCURRENCY))
+    return semaphores[host]
+
+async def _get_with_retry(
+    session: aiohttp.ClientSession,
+    semaphores: Dict[str, asyncio.Semaphore],
+    url: str,
+    params: Optional[Dict[str, str]] = None,
+    hold: float = 0.0
+) -> Tuple[int, bytes]:
+    """GET a URL under its host's concurrency limit, retrying transient failures with backoff.
+
+    ``hold`` keeps the host slot for that many extra seconds after the response is read.
+    """
+    semaphore = _host_semaphore(semaphores, url)
+    for attempt in range(RETRY_ATTEMPTS + 1):
+        try:
+            async with semaphore:
+                async with session.get(url, params=params) as response:
+                    status = response.status
+                    content = await response.read()
+                if hold:
+                    await asyncio.sleep(hold)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            if attempt == RETRY_ATTEMPTS:
+                raise
+        else:
+            if status not in RETRY_STATUSES or attempt == RETRY_ATTEMPTS:
+                return status, content
+        await asyncio.sleep(RETRY_BACKOFF * (2 ** attempt))
+
+async def _fetch_company_announcements(
+    session: aiohttp.ClientSession,
+    semaphores: Dict[str, asyncio.Semaphore],
+    company: Dict[str, str],
+    prev_date: datetime,
+    today: datetime
+) -> List[Tuple[datetime, Dict[str, Any]]]:
+    """Fetch project-related announcements for a single company as (date, output dict) pairs."""
+    announcements = []
     try:
-        announcements = []
+        logger.info(f"Scraping BSE announcements for {company['name']} ({company['symbol']})")
         
-        # Project-related keywords to filter announcements
-        project_keywords = [
-            'project', 'contract', 'order', 'steel', 'infrastructure',
-            'awarded', 'wins', 'secured', 'bags', 'development', 'execution',
-            'tender', 'bid', 'loa', 'letter of award', 'work order',
-            'construction', 'metro', 'railway', 'road', 'highway', 'bridge'
-        ]
-
-        # BSE API headers
-        headers = {
-            'authority': 'api.bseindia.com',
-            'accept': 'application/json, text/plain, */*',
-            'accept-language': 'en-US,en;q=0.9',
-            'origin': 'https://www.bseindia.com',
-            'referer': 'https://www.bseindia.com/',
-            'sec-ch-ua': '"Not A(Brand";v="99", "Google Chrome";v="121", "Chromium";v="121"',
-            'sec-ch-ua-mobile': '?0',
-            'sec-ch-ua-platform': '"Windows"',
-            'sec-fetch-dest': 'empty',
-            'sec-fetch-mode': 'cors',
-            'sec-fetch-site': 'same-site',
-            'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'
+        # BSE API endpoint
+        url = "https://api.bseindia.com/BseIndiaAPI/api/AnnGetData/w"
+        
+        # Query parameters
+        params = {
+            'strCat': '-1',
+            'strPrevDate': prev_date.strftime('%Y%m%d'),
+            'strScrip': company['scrip_code'],
+            'strSearch': 'P',
+            'strToDate': today.strftime('%Y%m%d'),
+            'strType': 'C'
         }
+        
+        # Keep a jittered pause while holding the API slot to avoid rate limiting
+        status, content = await _get_with_retry(
+            session, semaphores, url, params=params, hold=random.uniform(0.5, 1.5)
+        )
+        
+        if status == 200:
+            try:
+                result = orjson.loads(content)
+                if isinstance(result.get('Table'), list):
+                    for item in result['Table']:
+                        try:
+                            title = item.get('NEWSSUB', '').strip()
+                            title_lower = title.lower()
+                            
+                            # Check if announcement is project-related
+                            if any(keyword in title_lower for keyword in PROJECT_KEYWORDS):
+                                date_str = item.get('NEWS_DT', '').strip()
+                                try:
+                                    date = datetime.strptime(date_str.split('.')[0], '%Y-%m-%dT%H:%M:%S')
+                                except ValueError:
+                                    try:
+                                        date = datetime.strptime(date_str, '%d %b %Y')
+                                    except ValueError:
+                                        date = datetime.now()
+                                
+                                # Create attachment URL
+                                attachment_url = f"http://www.bseindia.com/stockinfo/AnnPdfOpen.aspx?Pname={item.get('ATTACHMENTNAME', '')}"
+                                
+                                # Extract project type from title
+                                project_type = _project_type_from_lower(title_lower)
+                                
+                                # Build the announcement directly in the output format
+                                announcement = {
+                                    "Title": title,
+                                    "Company": company['name'],
+                                    "Project Type": project_type,
+                                    "Location": "",
+                                    "Contract Value": "",
+                                    "Date": date.strftime('%Y-%m-%d'),
+                                    "Description": "",
+                                    "attachment_url": attachment_url
+                                }
+                                announcements.append((date, announcement))
+                                logger.debug(f"Added announcement: {title}")
+                        except Exception as e:
+                            logger.error(f"Error processing announcement for {company['symbol']}: {str(e)}")
+                            continue
+            except orjson.JSONDecodeError:
+                logger.error(f"Failed to parse JSON response for {company['symbol']}")
+        else:
+            logger.error(f"Failed to fetch announcements for {company['symbol']}: HTTP {status}")
+        
+    except Exception as e:
+        logger.error(f"Error scraping {company['symbol']}: {str(e)}")
+    
+    return announcements
 
-        # Get today's date and 30 days ago for the date range
-        today = datetime.now()
-        prev_date = today - timedelta(days=30)
+def _pdf_cache_path(url: str) -> str:
+    """Return the on-disk cache file for the extracted text of a PDF URL."""
+    key = hashlib.sha1(url.encode()).hexdigest()
+    return os.path.join(PDF_CACHE_DIR, f"{key}.txt")
 
-        for company in TARGET_COMPANIES:
+def _parse_pdf_text(content: bytes) -> Optional[str]:
+    """Return the first 1000 characters of a PDF's text, or None if it can't be parsed."""
+    try:
+        # Parse PDF content with PDFium's native text extraction
+        with PDFIUM_LOCK:
+            pdf = pdfium.PdfDocument(content)
             try:
-                logger.info(f"Scraping BSE announcements for {company['name']} ({company['symbol']})")
-                
-                # BSE API endpoint
-                url = "https://api.bseindia.com/BseIndiaAPI/api/AnnGetData/w"
-                
-                # Query parameters
-                params = {
-                    'strCat': '-1',
-                    'strPrevDate': prev_date.strftime('%Y%m%d'),
-                    'strScrip': company['scrip_code'],
-                    'strSearch': 'P',
-                    'strToDate': today.strftime('%Y%m%d'),
-                    'strType': 'C'
-                }
-                
-                response = requests.get(url, headers=headers, params=params, timeout=30)
-                
-                if response.status_code == 200:
-                    try:
-                        result = response.json()
-                        if isinstance(result.get('Table'), list):
-                            for item in result['Table']:
-                                try:
-                                    title = item.get('NEWSSUB', '').strip()
-                                    
-                                    # Check if announcement is project-related
-                                    if any(keyword in title.lower() for keyword in project_keywords):
-                                        date_str = item.get('NEWS_DT', '').strip()
-                                        try:
-                                            date = datetime.strptime(date_str.split('.')[0], '%Y-%m-%dT%H:%M:%S')
-                                        except ValueError:
-                                            try:
-                                                date = datetime.strptime(date_str, '%d %b %Y')
-                                            except ValueError:
-                                                date = datetime.now()
-                                        
-                                        # Create attachment URLs
-                                        attachment_url = f"http://www.bseindia.com/stockinfo/AnnPdfOpen.aspx?Pname={item.get('ATTACHMENTNAME', '')}"
-                                        xbrl_url = f"https://www.bseindia.com/Msource/90D/CorpXbrlGen.aspx?Bsenewid={item.get('NEWSID', '')}&Scripcode={company['scrip_code']}"
-                                        
-                                        # Extract project type from title
-                                        project_type = extract_project_type(title)
-                                        
-                                        # Create announcement object
-                                        announcement = BSEAnnouncement(
-                                            title=title,
-                                            date=date,
-                                            company=company['name'],
-                                            symbol=company['symbol'],
-                                            scrip_code=company['scrip_code'],
-                                            category=item.get('CATEGORYNAME', ''),
-                                            attachment_url=attachment_url,
-                                            xbrl_url=xbrl_url,
-                                            project_type=project_type
-                                        )
-                                        announcements.append(announcement)
-                                        logger.debug(f"Added announcement: {title}")
-                                except Exception as e:
-                                    logger.error(f"Error processing announcement for {company['symbol']}: {str(e)}")
-                                    continue
-                    except json.JSONDecodeError:
-                        logger.error(f"Failed to parse JSON response for {company['symbol']}")
-                else:
-                    logger.error(f"Failed to fetch announcements for {company['symbol']}: HTTP {response.status_code}")
-                
-                # Add delay between requests to avoid rate limiting
-                time.sleep(2)
-                
+                text_parts = []
+                total = 0
+                for page in pdf:
+                    page_text = page.get_textpage().get_text_range()
+                    if page_text:
+                        text_parts.append(page_text + "\n")
+                        total += len(page_text) + 1
+                        # Only the first 1000 characters are kept, so skip the remaining pages
+                        if total >= 1000:
+                            break
+                text = "".join(text_parts)
+                return text[:1000] if text else ""
             except Exception as e:
-                logger.error(f"Error scraping {company['symbol']}: {str(e)}")
-                continue
+                logger.error(f"Error parsing PDF: {str(e)}")
+            finally:
+                pdf.close()
+    except Exception as e:
+        logger.error(f"Error reading PDF content: {str(e)}")
+    return None
+
+async def _download_pdf_text(
+    session: aiohttp.ClientSession,
+    semaphores: Dict[str, asyncio.Semaphore],
+    url: str
+) -> Optional[str]:
+    """Download a PDF and return the first 1000 characters of its text, or None on failure."""
+    try:
+        logger.info(f"Extracting PDF content from {url}")
+        status, content = await _get_with_retry(session, semaphores, url)
+    except Exception as e:
+        logger.error(f"Error downloading PDF: {str(e)}")
+        return None
+
+    if status != 200:
+        logger.error(f"Failed to download PDF: HTTP {status}")
+        return None
+
+    # PDF parsing is CPU-bound, so keep it off the event loop
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(PDF_PARSE_EXECUTOR, _parse_pdf_text, content)
+
+def _read_cached_pdf_text(url: str) -> Optional[str]:
+    """Return cached PDF text for a URL, or None on a cache miss."""
+    try:
+        with open(_pdf_cache_path(url), 'r', encoding='utf-8') as f:
+            return f.read()
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Error reading cached PDF text for {url}: {str(e)}")
+    return None
+
+def _write_cached_pdf_text(url: str, text: str) -> None:
+    """Store extracted PDF text for a URL in the disk cache."""
+    cache_path = _pdf_cache_path(url)
+    try:
+        os.makedirs(PDF_CACHE_DIR, exist_ok=True)
+        # Write to a temporary file first so readers never see a partial entry
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        logger.warning(f"Error caching PDF text for {url}: {str(e)}")
+
+async def _load_pdf_text(
+    session: aiohttp.ClientSession,
+    semaphores: Dict[str, asyncio.Semaphore],
+    url: str
+) -> Optional[str]:
+    """Return extracted PDF text from the disk cache, downloading and caching it on a miss."""
+    text = _read_cached_pdf_text(url)
+    if text is not None:
+        return text
+
+    text = await _download_pdf_text(session, semaphores, url)
+    if text is not None:
+        _write_cached_pdf_text(url, text)
+    return text
+
+async def _enrich_with_pdf(
+    session: aiohttp.ClientSession,
+    semaphores: Dict[str, asyncio.Semaphore],
+    announcement: Dict[str, Any]
+) -> None:
+    """Load the announcement PDF text and fill in details extracted from it."""
+    if not announcement["attachment_url"]:
+        return
+
+    full_text = await _load_pdf_text(session, semaphores, announcement["attachment_url"])
+    if full_text is None:
+        return
+
+    # Use the PDF content as the description
+    announcement["Description"] = full_text
+
+    # Extract more details from full text content
+    combined_text = announcement["Title"] + " " + announcement["Company"] + " " + full_text
+
+    # Extract project type, location and contract value together
+    refined_type, location, contract_value = extract_all(combined_text)
+
+    # Try to extract location
+    if not announcement["Location"]:
+        announcement["Location"] = location
+
+    # Try to extract contract value
+    if not announcement["Contract Value"]:
+        announcement["Contract Value"] = contract_value
+
+    # Refine project type if needed
+    if announcement["Project Type"] == "Infrastructure Project" or not announcement["Project Type"]:
+        if refined_type != "Infrastructure Project":
+            announcement["Project Type"] = refined_type
+
+async def _scrape_announcements_async(prev_date: datetime, today: datetime) -> List[Dict[str, Any]]:
+    """Fetch announcements for all target companies and enrich them from their PDFs."""
+    semaphores: Dict[str, asyncio.Semaphore] = {}
+    connector = aiohttp.TCPConnector(limit=MAX_CONNECTIONS)
+    async with aiohttp.ClientSession(headers=BSE_HEADERS, connector=connector, timeout=REQUEST_TIMEOUT) as session:
+        # Fetch all companies concurrently
+        results = await asyncio.gather(*(
+            _fetch_company_announcements(session, semaphores, company, prev_date, today)
+            for company in TARGET_COMPANIES
+        ))
+        dated_announcements = [pair for company_announcements in results for pair in company_announcements]
         
         # Sort announcements by date (newest first)
-        announcements.sort(key=lambda x: x.date, reverse=True)
+        dated_announcements.sort(key=lambda x: x[0], reverse=True)
+        formatted_announcements = [announcement for _, announcement in dated_announcements]
         
-        # Extract PDF content and additional details
-        for announcement in announcements:
-            if announcement.attachment_url:
-                try:
-                    logger.info(f"Extracting PDF content from {announcement.attachment_url}")
-                    # Use a 30-second timeout for PDF downloads
-                    pdf_response = requests.get(announcement.attachment_url, headers=headers, timeout=30)
-                    
-                    if pdf_response.status_code == 200:
-                        try:
-                            # Parse PDF content
-                            with io.BytesIO(pdf_response.content) as pdf_file:
-                                try:
-                                    pdf_reader = PyPDF2.PdfReader(pdf_file)
-                                    text = ""
-                                    for page in pdf_reader.pages:
-                                        page_text = page.extract_text()
-                                        if page_text:
-                                            text += page_text + "\n"
-                                    
-                                    # Store the PDF content
-                                    full_text = text[:1000] if text else ""
-                                    announcement.pdf_content = full_text
-                                    
-                                    # Set description from PDF content
-                                    announcement.description = full_text
-                                    
-                                    # Extract more details from full text content
-                                    combined_text = announcement.title + " " + announcement.company + " " + full_text
-                                    
-                                    # Try to extract location
-                                    if not announcement.location:
-                                        location = extract_location(combined_text)
-                                        announcement.location = location
-                                    
-                                    # Try to extract contract value
-                                    if not announcement.contract_value:
-                                        contract_value = extract_contract_value(combined_text)
-                                        announcement.contract_value = contract_value
-                                    
-                                    # Refine project type if needed
-                                    if announcement.project_type == "Infrastructure Project" or not announcement.project_type:
-                                        refined_type = extract_project_type(combined_text)
-                                        if refined_type != "Infrastructure Project":
-                                            announcement.project_type = refined_type
-                                except Exception as e:
-                                    logger.error(f"Error parsing PDF: {str(e)}")
-                        except Exception as e:
-                            logger.error(f"Error reading PDF content: {str(e)}")
-                    else:
-                        logger.error(f"Failed to download PDF: HTTP {pdf_response.status_code}")
-                except Exception as e:
-                    logger.error(f"Error downloading PDF: {str(e)}")
-        
-        # Convert to the new requested format
-        formatted_announcements = []
-        for announcement in announcements:
-            formatted_announcement = {
-                "Title": announcement.title,
-                "Company": announcement.company,
-                "Project Type": announcement.project_type,
-                "Location": announcement.location,
-                "Contract Value": announcement.contract_value,
-                "Date": announcement.date.strftime('%Y-%m-%d'),
-                "Description": announcement.pdf_content,
-                "attachment_url":announcement.attachment_url
-            }
-            formatted_announcements.append(formatted_announcement)
+        # Extract PDF content and additional details concurrently
+        await asyncio.gather(*(
+            _enrich_with_pdf(session, semaphores, announcement)
+            for announcement in formatted_announcements
+        ))
+    
+    return formatted_announcements
+
+def scrape_bse_announcements() -> List[Dict[str, Any]]:
+    """Scrape steel and infrastructure related announcements from BSE company pages."""
+    try:
+        # Get today's date and 30 days ago for the date range
+        today = datetime.now()
+        prev_date = today - timedelta(days=30)
+
+        formatted_announcements = asyncio.run(_scrape_announcements_async(prev_date, today))
         
         # Save announcements to JSON file
         try:
             output_path = os.path.join(os.path.dirname(__file__), 'bse_announcements.json')
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(
-                    formatted_announcements,
-                    f,
-                    indent=2,
-                    default=str
-                )
+            blob = orjson.dumps(formatted_announcements, option=orjson.OPT_INDENT_2, default=str)
+            # Write in one go to a temp file and swap it in so readers never see a partial file
+            tmp_path = output_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(blob)
+            os.replace(tmp_path, output_path)
             logger.info(f"Total project-related announcements found: {len(formatted_announcements)}")
             logger.info(f"Saved announcements to {output_path}")
         except Exception as e:
@@ -1,17 +1,27 @@
 """BSE announcement scraper module focusing on infrastructure and project-related announcements."""
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set, Tuple
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 import logging
-from pydantic import BaseModel, Field
+from dataclasses import dataclass
 import time
 import json
+import orjson
+import hashlib
 import os
-import io
-import PyPDF2  # Add PyPDF2 import for PDF parsing
+import tempfile
+import pypdfium2 as pdfium
+# PDFium is not thread-safe, so every pdfium call is made under this process-wide lock;
+# downloads still run in parallel across the worker threads
+from pdfium_lock import PDFIUM_LOCK
 import re
+from bisect import bisect_right
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Configure logging
 logging.basicConfig(
@@ -213,6 +223,38 @@ PROJECT_TYPE_MAPPING = {
     'order': 'Order/Contract'
 }
 
+# Value indicators in a title (e.g., "Rs. 100 crore", "USD 50 million")
+VALUE_INDICATORS = (
+    'rs.', 'rs', 'inr', 'usd', '₹', '$', 'crore', 'million', 'billion',
+    'tonnes', 'tons', 'tpa', 'mtpa', 'mw', 'gw', 'sqft', 'acres'
+)
+
+# Strong keywords that indicate relevant announcements
+STRONG_KEYWORDS = (
+    'project', 'infrastructure', 'construction', 'awarded', 'contract', 'order',
+    'steel', 'factory', 'plant', 'production', 'manufacturing', 'capacity',
+    'facility', 'commissioning', 'commercial production'
+)
+
+# Combined patterns for the keyword lists so each text is scanned once
+VALUE_INDICATOR_PATTERN = re.compile('|'.join(re.escape(indicator) for indicator in VALUE_INDICATORS))
+STRONG_KEYWORD_PATTERN = re.compile('|'.join(re.escape(keyword) for keyword in STRONG_KEYWORDS))
+EXCLUDE_PATTERN = re.compile('|'.join(re.escape(keyword.lower()) for keyword in EXCLUDE_KEYWORDS))
+INFRA_PATTERN = re.compile('|'.join(re.escape(keyword.lower()) for keyword in INFRA_KEYWORDS))
+
+# Keywords ordered longest first (ties keep mapping order) so the most specific
+# keyword wins, with the rank and project type looked up once per regex hit
+PROJECT_KEYWORD_PAYLOADS = {
+    keyword: (rank, PROJECT_TYPE_MAPPING[keyword])
+    for rank, keyword in enumerate(sorted(PROJECT_TYPE_MAPPING, key=len, reverse=True))
+}
+
+# Combined pattern for all project type keywords; the lookahead keeps overlapping
+# keywords (e.g. 'hydropower' and 'power plant') visible to a single finditer pass
+PROJECT_TYPE_PATTERN = re.compile(
+    '(?=(' + '|'.join(re.escape(keyword) for keyword in PROJECT_KEYWORD_PAYLOADS) + '))'
+)
+
 # List of Indian states and major cities for location detection
 INDIAN_LOCATIONS = [
     'andhra pradesh', 'arunachal pradesh', 'assam', 'bihar', 'chhattisgarh', 'goa', 'gujarat', 
@@ -228,118 +270,179 @@ INDIAN_LOCATIONS = [
     'rajkot', 'kalyan', 'vasai', 'varanasi', 'srinagar', 'ghaziabad', 'amritsar', 'raipur'
 ]
 
-class BSEAnnouncement(BaseModel):
+# Locations in priority order (duplicates dropped) and one word-bounded pattern for
+# all of them, so e.g. 'goa' no longer matches inside 'goal'
+LOCATION_RANK = {location: rank for rank, location in enumerate(dict.fromkeys(INDIAN_LOCATIONS))}
+LOCATION_PATTERN = re.compile(
+    r'(?=\b(' + '|'.join(re.escape(location) for location in LOCATION_RANK) + r')\b)'
+)
+
+# Fallback "in [location]" pattern, matched against the original casing
+LOCATION_FALLBACK_PATTERN = re.compile(r'in\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)')
+
+# Contract value patterns, matched against lowercased text
+# INR/Rs patterns
+INR_PATTERN = re.compile(r'(?:rs\.?|inr|₹)\s*(\d+(?:,\d+)*(?:\.\d+)?)\s*(?:crore|cr\.?|lakh|lac|million|mn|billion|bn)')
+
+# USD patterns
+USD_PATTERN = re.compile(r'(?:usd|\$)\s*(\d+(?:,\d+)*(?:\.\d+)?)\s*(?:million|mn|billion|bn)')
+
+# Value with units
+VALUE_PATTERN = re.compile(r'(\d+(?:,\d+)*(?:\.\d+)?)\s*(?:crore|cr\.?|lakh|lac|million|mn|billion|bn|mw|gw|mwp)')
+
+# Combined pattern for "value of" expressions
+VALUE_OF_PATTERN = re.compile(r'(?:value|worth|amount|order value|contract value|size) of (?:rs\.?|inr|₹|usd|\$)?\s*(\d+(?:,\d+)*(?:\.\d+)?)\s*(?:crore|cr\.?|lakh|lac|million|mn|billion|bn)')
+
+# Currency hints used to label bare "value of" amounts
+INR_HINT_PATTERN = re.compile(r'rs|inr|₹')
+USD_HINT_PATTERN = re.compile(r'usd|\$')
+
+# PDF downloads are streamed into a spooled file that moves to disk past this size
+PDF_SPOOL_MAX_SIZE = 2 * 1024 * 1024
+PDF_CHUNK_SIZE = 64 * 1024
+
+# Extracted PDF text is cached here (shared with bse_scraper.py) so repeat runs skip the download and parse
+PDF_CACHE_DIR = os.path.join('.cache', 'bse_pdfs')
+
+@dataclass(slots=True)
+class BSEAnnouncement:
     """Model for BSE announcements"""
-    title: str = Field(default="")
     date: datetime
-    company: str = Field(default="")
-    security_code: str = Field(default="")
-    category: str = Field(default="")
-    sub_category: str = Field(default="")
-    attachment_url: str = Field(default="")
-    pdf_content: str = Field(default="")
-    is_infra_related: bool = Field(default=False)
-    project_type: str = Field(default="")
-    location: str = Field(default="")
-    contract_value: str = Field(default="")
-    description: str = Field(default="")
-
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.strftime('%Y-%m-%d %H:%M:%S')
-        }
+    title: str = ""
+    company: str = ""
+    security_code: str = ""
+    category: str = ""
+    sub_category: str = ""
+    attachment_url: str = ""
+    xbrl_url: str = ""
+    pdf_content: str = ""
+    is_infra_related: bool = False
+    project_type: str = ""
+    location: str = ""
+    contract_value: str = ""
+    description: str = ""
 
 def safe_get(data: dict, key: str, default: str = "") -> str:
     """Safely get a string value from a dictionary."""
     value = data.get(key)
     return str(value).strip() if value is not None else default
 
+def _parse_bse_date(date_str: str) -> Optional[datetime]:
+    """Parse a BSE NEWS_DT value, dispatching on its shape so the common case never raises."""
+    # First try the ISO format that BSE actually uses (fractional seconds are dropped)
+    iso_str = date_str.split('.', 1)[0]
+    if len(iso_str) == 19 and iso_str[10] == 'T':
+        try:
+            return datetime.fromisoformat(iso_str)
+        except ValueError:
+            pass
+    
+    # Then the standard BSE format and the simple date format, likeliest first
+    if len(date_str) == 10 and date_str[4] == '-':
+        formats = ('%Y-%m-%d', '%d %b %Y')
+    else:
+        formats = ('%d %b %Y', '%Y-%m-%d')
+    for date_format in formats:
+        try:
+            return datetime.strptime(date_str, date_format)
+        except ValueError:
+            continue
+    return None
+
 def is_infrastructure_related(title: str, company: str, security_code: str) -> bool:
     """Check if the announcement is infrastructure-related."""
     title_lower = title.lower()
     company_lower = company.lower()
     
     # First check exclusions
-    if any(keyword.lower() in title_lower for keyword in EXCLUDE_KEYWORDS):
+    if EXCLUDE_PATTERN.search(title_lower):
         return False
     
-    # Look for value indicators (e.g., "Rs. 100 crore", "USD 50 million")
-    value_indicators = ['rs.', 'rs', 'inr', 'usd', '₹', '$', 'crore', 'million', 'billion',
-                       'tonnes', 'tons', 'tpa', 'mtpa', 'mw', 'gw', 'sqft', 'acres']
-    has_value = any(indicator in title_lower for indicator in value_indicators)
+    # Without an infrastructure keyword nothing else can qualify the announcement
+    if not (INFRA_PATTERN.search(title_lower) or INFRA_PATTERN.search(company_lower)):
+        return False
     
-    # Strong keywords that indicate relevant announcements
-    strong_keywords = [
-        'project', 'infrastructure', 'construction', 'awarded', 'contract', 'order',
-        'steel', 'factory', 'plant', 'production', 'manufacturing', 'capacity',
-        'facility', 'commissioning', 'commercial production'
+    # Qualify on a value indicator (e.g., "Rs. 100 crore", "USD 50 million")
+    # or a strong infrastructure keyword in the title
+    return bool(VALUE_INDICATOR_PATTERN.search(title_lower) or STRONG_KEYWORD_PATTERN.search(title_lower))
+
+def _join_lower(texts: List[str]) -> Tuple[str, List[int]]:
+    """Lowercase and newline-join texts, returning the blob and each text's start offset."""
+    lowered = [text.lower() for text in texts]
+    offsets = []
+    position = 0
+    for text_lower in lowered:
+        offsets.append(position)
+        position += len(text_lower) + 1
+    return '\n'.join(lowered), offsets
+
+def _matching_rows(pattern: re.Pattern, blob: str, offsets: List[int]) -> Set[int]:
+    """Return the indices of the joined texts that contain a match for pattern."""
+    # Keywords never contain a newline, so a match always falls inside a single text
+    return {bisect_right(offsets, match.start()) - 1 for match in pattern.finditer(blob)}
+
+def classify_infrastructure_batch(titles: List[str], companies: List[str]) -> List[bool]:
+    """Batch version of is_infrastructure_related: one regex pass per keyword list over all rows."""
+    title_blob, title_offsets = _join_lower(titles)
+    company_blob, company_offsets = _join_lower(companies)
+    
+    excluded = _matching_rows(EXCLUDE_PATTERN, title_blob, title_offsets)
+    has_infra_keyword = (_matching_rows(INFRA_PATTERN, title_blob, title_offsets)
+                         | _matching_rows(INFRA_PATTERN, company_blob, company_offsets))
+    qualified = (_matching_rows(VALUE_INDICATOR_PATTERN, title_blob, title_offsets)
+                 | _matching_rows(STRONG_KEYWORD_PATTERN, title_blob, title_offsets))
+    
+    return [
+        index in has_infra_keyword and index in qualified and index not in excluded
+        for index in range(len(titles))
     ]
-    
-    # Check for infrastructure keywords
-    has_infra_keyword = any(keyword.lower() in title_lower or keyword.lower() in company_lower 
-                          for keyword in INFRA_KEYWORDS)
-    
-    # Return True if we have both a value and an infrastructure keyword,
-    # or if we have a strong infrastructure keyword
-    return has_infra_keyword and (has_value or 
-                                 any(keyword in title_lower for keyword in strong_keywords))
 
-def extract_project_type(text: str) -> str:
-    """Extract project type from text."""
-    text_lower = text.lower()
-    
-    # Find all matching keywords
-    matches = []
-    for keyword, project_type in PROJECT_TYPE_MAPPING.items():
-        if keyword.lower() in text_lower:
-            matches.append((keyword, project_type))
-    
-    # Sort by keyword length (longer matches are more specific)
-    matches.sort(key=lambda x: len(x[0]), reverse=True)
-    
-    # Return the most specific match, or a default
-    if matches:
-        return matches[0][1]
-    return "Infrastructure Project"
+def extract_project_type(text: str, text_lower: Optional[str] = None) -> str:
+    """Extract project type from text; text_lower can be passed if the caller already has it."""
+    if text_lower is None:
+        text_lower = text.lower()
+    
+    # Single pass over the text keeping only the most specific (longest) keyword seen so far
+    best_rank = len(PROJECT_KEYWORD_PAYLOADS)
+    best_type = "Infrastructure Project"
+    for match in PROJECT_TYPE_PATTERN.finditer(text_lower):
+        rank, project_type = PROJECT_KEYWORD_PAYLOADS[match.group(1)]
+        if rank < best_rank:
+            best_rank = rank
+            best_type = project_type
+            # Nothing can beat the longest keyword
+            if rank == 0:
+                break
+    return best_type
 
-def extract_location(text: str) -> str:
-    """Extract location information from text."""
-    text_lower = text.lower()
+def extract_location(text: str, text_lower: Optional[str] = None) -> str:
+    """Extract location information from text; text_lower can be passed if the caller already has it."""
+    if text_lower is None:
+        text_lower = text.lower()
     
-    # Check for Indian locations
-    for location in INDIAN_LOCATIONS:
-        if location in text_lower:
-            # Capitalize properly
-            return location.title()
+    # Check for Indian locations, preferring the earliest entry in INDIAN_LOCATIONS
+    locations = [match.group(1) for match in LOCATION_PATTERN.finditer(text_lower)]
+    if locations:
+        # Capitalize properly
+        return min(locations, key=LOCATION_RANK.__getitem__).title()
     
     # Look for "in [location]" pattern
-    location_pattern = r'in\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)'
-    matches = re.findall(location_pattern, text)
-    if matches:
-        return matches[0]
+    match = LOCATION_FALLBACK_PATTERN.search(text)
+    if match:
+        return match.group(1)
     
     return ""
 
-def extract_contract_value(text: str) -> str:
-    """Extract contract value from text."""
-    text_lower = text.lower()
+def extract_contract_value(text: str, text_lower: Optional[str] = None) -> str:
+    """Extract contract value from text; text_lower can be passed if the caller already has it."""
+    if text_lower is None:
+        text_lower = text.lower()
     
     # Look for currency patterns
-    # INR/Rs patterns
-    inr_pattern = r'(?:rs\.?|inr|₹)\s*(\d+(?:,\d+)*(?:\.\d+)?)\s*(?:crore|cr\.?|lakh|lac|million|mn|billion|bn)'
-    inr_matches = re.findall(inr_pattern, text_lower)
-    
-    # USD patterns
-    usd_pattern = r'(?:usd|\$)\s*(\d+(?:,\d+)*(?:\.\d+)?)\s*(?:million|mn|billion|bn)'
-    usd_matches = re.findall(usd_pattern, text_lower)
-    
-    # Value with units
-    value_pattern = r'(\d+(?:,\d+)*(?:\.\d+)?)\s*(?:crore|cr\.?|lakh|lac|million|mn|billion|bn|mw|gw|mwp)'
-    value_matches = re.findall(value_pattern, text_lower)
-    
-    # Combined pattern for "value of" expressions
-    value_of_pattern = r'(?:value|worth|amount|order value|contract value|size) of (?:rs\.?|inr|₹|usd|\$)?\s*(\d+(?:,\d+)*(?:\.\d+)?)\s*(?:crore|cr\.?|lakh|lac|million|mn|billion|bn)'
-    value_of_matches = re.findall(value_of_pattern, text_lower)
+    inr_matches = INR_PATTERN.findall(text_lower)
+    usd_matches = USD_PATTERN.findall(text_lower)
+    value_matches = VALUE_PATTERN.findall(text_lower)
+    value_of_matches = VALUE_OF_PATTERN.findall(text_lower)
     
     # Combine all matches
     all_matches = []
@@ -351,9 +454,9 @@ def extract_contract_value(text: str) -> str:
         all_matches.append(f"USD {usd_matches[0]} million")
     
     if value_of_matches:
-        if "rs" in text_lower or "inr" in text_lower or "₹" in text_lower:
+        if INR_HINT_PATTERN.search(text_lower):
             all_matches.append(f"Rs. {value_of_matches[0]} crore")
-        elif "usd" in text_lower or "$" in text_lower:
+        elif USD_HINT_PATTERN.search(text_lower):
             all_matches.append(f"USD {value_of_matches[0]} million")
         else:
             all_matches.append(f"{value_of_matches[0]} crore")
@@ -364,12 +467,220 @@ def extract_contract_value(text: str) -> str:
     
     return all_matches[0] if all_matches else ""
 
+def _pdf_cache_path(url: str) -> str:
+    """Return the on-disk cache file for the extracted text of a PDF URL."""
+    key = hashlib.sha1(url.encode()).hexdigest()
+    return os.path.join(PDF_CACHE_DIR, f"{key}.txt")
+
+def _download_pdf_text(url: str, session: requests.Session) -> Optional[str]:
+    """Download a PDF and return the first 1000 characters of its text, or None on failure."""
+    try:
+        logger.info(f"Extracting PDF content from {url}")
+        # Use a 30-second timeout for PDF downloads; stream the body instead of buffering it
+        with session.get(url, timeout=30, stream=True) as pdf_response, \
+                tempfile.SpooledTemporaryFile(max_size=PDF_SPOOL_MAX_SIZE) as pdf_file:
+            if pdf_response.status_code != 200:
+                logger.error(f"Failed to download PDF: HTTP {pdf_response.status_code}")
+                return None
+
+            # Small PDFs stay in memory, larger ones spill to disk
+            for chunk in pdf_response.iter_content(chunk_size=PDF_CHUNK_SIZE):
+                pdf_file.write(chunk)
+            pdf_file.seek(0)
+
+            try:
+                # Parse PDF content with PDFium's native text extraction
+                with PDFIUM_LOCK:
+                    pdf = pdfium.PdfDocument(pdf_file)
+                    try:
+                        text_parts = []
+                        total = 0
+                        for page in pdf:
+                            page_text = page.get_textpage().get_text_range()
+                            if page_text:
+                                text_parts.append(page_text + "\n")
+                                total += len(page_text) + 1
+                                # Only the first 1000 characters are kept, so skip the remaining pages
+                                if total >= 1000:
+                                    break
+                        text = "".join(text_parts)
+                        return text[:1000] if text else ""
+                    except Exception as e:
+                        logger.error(f"Error parsing PDF: {str(e)}")
+                    finally:
+                        pdf.close()
+            except Exception as e:
+                logger.error(f"Error reading PDF content: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error downloading PDF: {str(e)}")
+    return None
+
+def _load_pdf_text(url: str, session: requests.Session) -> Optional[str]:
+    """Return extracted PDF text from the disk cache, downloading and caching it on a miss."""
+    cache_path = _pdf_cache_path(url)
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Error reading cached PDF text for {url}: {str(e)}")
+
+    text = _download_pdf_text(url, session)
+    if text is not None:
+        try:
+            os.makedirs(PDF_CACHE_DIR, exist_ok=True)
+            # Write to a temporary file first so readers never see a partial entry
+            tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            logger.warning(f"Error caching PDF text for {url}: {str(e)}")
+    return text
+
+def _fetch_and_parse(url: str, announcements: List[BSEAnnouncement], session: requests.Session) -> None:
+    """Load a PDF once and fill in details for every announcement that links to it."""
+    full_text = _load_pdf_text(url, session)
+    if full_text is None:
+        return
+
+    for announcement in announcements:
+        # Store the PDF content
+        announcement.pdf_content = full_text
+
+        # Set description from PDF content
+        announcement.description = full_text
+
+        # Only refine the project type when the title didn't already give a specific one
+        needs_project_type = announcement.project_type in ("", "Infrastructure Project")
+        if announcement.location and announcement.contract_value and not needs_project_type:
+            continue
+
+        # Extract more details from full text content
+        combined_text = announcement.title + " " + announcement.company + " " + full_text
+        combined_lower = combined_text.lower()
+
+        # Try to extract location
+        if not announcement.location:
+            location = extract_location(combined_text, combined_lower)
+            announcement.location = location
+
+        # Try to extract contract value
+        if not announcement.contract_value:
+            contract_value = extract_contract_value(combined_text, combined_lower)
+            announcement.contract_value = contract_value
+
+        # Refine project type if needed
+        if needs_project_type:
+            refined_type = extract_project_type(combined_text, combined_lower)
+            if refined_type != "Infrastructure Project":
+                announcement.project_type = refined_type
+
+def _fetch_window(session: requests.Session, api_url: str, start_date: datetime, end_date: datetime) -> List[BSEAnnouncement]:
+    """Fetch infrastructure-related announcements for one date window from the BSE API."""
+    announcements = []
+    try:
+        # Query parameters for the API
+        params = {
+            'strCat': '-1',  # All categories
+            'strPrevDate': start_date.strftime('%Y%m%d'),
+            'strScrip': '',  # All companies
+            'strSearch': 'P',
+            'strToDate': end_date.strftime('%Y%m%d'),
+            'strType': 'C'
+        }
+
+        logger.info(f"Fetching announcements from {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
+
+        # Make the API request
+        response = session.get(api_url, params=params, timeout=30)
+        
+        if response.status_code == 200:
+            try:
+                data = response.json()
+                if isinstance(data.get('Table'), list):
+                    # Collect titled rows so the whole batch is classified in one pass
+                    rows = []
+                    for item in data['Table']:
+                        try:
+                            title = safe_get(item, 'NEWSSUB')
+                            # Skip if no title
+                            if title:
+                                rows.append((item, title, safe_get(item, 'SLONGNAME')))
+                        except Exception as e:
+                            logger.error(f"Error processing announcement: {str(e)}")
+                    
+                    # Check which announcements are infrastructure-related
+                    infra_flags = classify_infrastructure_batch(
+                        [title for _, title, _ in rows],
+                        [company for _, _, company in rows]
+                    )
+                    
+                    for (item, title, company), is_infra in zip(rows, infra_flags):
+                        if not is_infra:
+                            continue
+                        try:
+                            # Get announcement details with safe defaults
+                            date_str = safe_get(item, 'NEWS_DT')
+                            security_code = safe_get(item, 'SCRIP_CD')
+                            category = safe_get(item, 'CATEGORYNAME')
+                            attachment_name = safe_get(item, 'ATTACHMENTNAME')
+                            
+                            # Parse date with better error handling
+                            date = _parse_bse_date(date_str)
+                            if date is None:
+                                logger.warning(f"Could not parse date '{date_str}' for announcement: {title}")
+                                # Use the date from the current batch as fallback
+                                date = start_date
+                            
+                            # Create attachment URLs exactly as in the original
+                            attachment_url = f"http://www.bseindia.com/stockinfo/AnnPdfOpen.aspx?Pname={item.get('ATTACHMENTNAME', '')}"
+                            # Ensure there's no whitespace in the attachment URL
+                            attachment_url = attachment_url.strip()
+                            xbrl_url = f"https://www.bseindia.com/Msource/90D/CorpXbrlGen.aspx?Bsenewid={item.get('NEWSID', '')}&Scripcode={security_code}"
+                            
+                            # Extract project type from title and company
+                            project_type = extract_project_type(title + " " + company)
+                            
+                            # Create announcement object with the parsed date
+                            announcement = BSEAnnouncement(
+                                title=title,
+                                date=date,
+                                company=company,
+                                security_code=security_code,
+                                category=category,
+                                attachment_url=attachment_url,
+                                xbrl_url=xbrl_url,
+                                is_infra_related=is_infra,
+                                project_type=project_type
+                            )
+                            announcements.append(announcement)
+                            logger.debug(f"Added announcement: {title}")
+                        
+                        except Exception as e:
+                            logger.error(f"Error processing announcement: {str(e)}")
+                            continue
+                    
+                    logger.info(f"Found {len(announcements)} infrastructure-related announcements in this batch")
+                else:
+                    logger.error("Invalid response format: 'Table' not found or not a list")
+            except json.JSONDecodeError:
+                logger.error("Failed to parse JSON response")
+        else:
+            logger.error(f"Failed to fetch announcements: HTTP {response.status_code}")
+        
+        # Hold the worker briefly to keep the request rate polite
+        time.sleep(1)
+    
+    except Exception as e:
+        logger.error(f"Error during API request: {str(e)}")
+    
+    return announcements
+
 def scrape_bse_announcements() -> List[Dict[str, Any]]:
     """Scrape infrastructure and project-related announcements from BSE."""
     try:
-        announcements = []
-        infra_announcements = []
-        
         # BSE API endpoint for announcements
         api_url = "https://api.bseindia.com/BseIndiaAPI/api/AnnGetData/w"
         
@@ -389,178 +700,60 @@ def scrape_bse_announcements() -> List[Dict[str, Any]]:
             'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'
         }
         
+        # Pooled session so the API calls and PDF downloads reuse keep-alive connections
+        session = requests.Session()
+        session.headers.update(headers)
+        adapter = HTTPAdapter(
+            pool_connections=20,
+            pool_maxsize=20,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        
         # Get today's date and 1 year ago for the date range
         today = SCRAPER_DATE
         one_year_ago = today - timedelta(days=60)
             
-        # Since BSE API might limit results per request, we'll fetch data month by month
+        # Since BSE API might limit results per request, split the range into monthly windows
+        windows = []
         current_date = one_year_ago
         while current_date <= today:
-            try:
-                # Calculate end date for this iteration (1 month from current_date or today)
-                end_date = min(current_date + timedelta(days=30), today)
-                
-                # Query parameters for the API
-                params = {
-                    'strCat': '-1',  # All categories
-                    'strPrevDate': current_date.strftime('%Y%m%d'),
-                    'strScrip': '',  # All companies
-                    'strSearch': 'P',
-                    'strToDate': end_date.strftime('%Y%m%d'),
-                    'strType': 'C'
-                }
-
-                logger.info(f"Fetching announcements from {current_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
-
-                # Make the API request
-                response = requests.get(api_url, headers=headers, params=params, timeout=30)
-                
-                if response.status_code == 200:
-                    try:
-                        data = response.json()
-                        if isinstance(data.get('Table'), list):
-                            for item in data['Table']:
-                                try:
-                                    # Get announcement details with safe defaults
-                                    title = safe_get(item, 'NEWSSUB')
-                                    date_str = safe_get(item, 'NEWS_DT')
-                                    company = safe_get(item, 'SLONGNAME')
-                                    security_code = safe_get(item, 'SCRIP_CD')
-                                    category = safe_get(item, 'CATEGORYNAME')
-                                    attachment_name = safe_get(item, 'ATTACHMENTNAME')
-                                    
-                                    # Skip if no title
-                                    if not title:
-                                        continue
-                                    
-                                    # Check if announcement is infrastructure-related
-                                    is_infra = is_infrastructure_related(title, company, security_code)
-                                    if not is_infra:
-                                        continue
-                                    
-                                    # Parse date with better error handling
-                                    try:
-                                        # First try the ISO format that BSE actually uses
-                                        date = datetime.strptime(date_str.split('.')[0], '%Y-%m-%dT%H:%M:%S')
-                                    except ValueError:
-                                        try:
-                                            # Try the standard BSE format as fallback
-                                            date = datetime.strptime(date_str, '%d %b %Y')
-                                        except ValueError:
-                                            try:
-                                                # Try simple date format as last resort
-                                                date = datetime.strptime(date_str, '%Y-%m-%d')
-                                            except ValueError:
-                                                logger.warning(f"Could not parse date '{date_str}' for announcement: {title}")
-                                                # Use the date from the current batch as fallback
-                                                date = current_date
-                                    
-                                    # Create attachment URLs exactly as in the original
-                                    attachment_url = f"http://www.bseindia.com/stockinfo/AnnPdfOpen.aspx?Pname={item.get('ATTACHMENTNAME', '')}"
-                                    # Ensure there's no whitespace in the attachment URL
-                                    attachment_url = attachment_url.strip()
-                                    xbrl_url = f"https://www.bseindia.com/Msource/90D/CorpXbrlGen.aspx?Bsenewid={item.get('NEWSID', '')}&Scripcode={security_code}"
-                                    
-                                    # Extract project type from title and company
-                                    project_type = extract_project_type(title + " " + company)
-                                    
-                                    # Create announcement object with the parsed date
-                                    announcement = BSEAnnouncement(
-                                        title=title,
-                                        date=date.replace(microsecond=0),  # Remove microseconds for cleaner output
-                                        company=company,
-                                        security_code=security_code,
-                                        category=category,
-                                        attachment_url=attachment_url,
-                                        xbrl_url=xbrl_url,
-                                        is_infra_related=is_infra,
-                                        project_type=project_type
-                                    )
-                                    announcements.append(announcement)
-                                    if is_infra:
-                                        infra_announcements.append(announcement)
-                                    logger.debug(f"Added announcement: {title}")
-                                    
-                                except Exception as e:
-                                    logger.error(f"Error processing announcement: {str(e)}")
-                                    continue
-                                    
-                            logger.info(f"Found {len(infra_announcements)} infrastructure-related announcements in this batch")
-                        else:
-                            logger.error("Invalid response format: 'Table' not found or not a list")
-                    except json.JSONDecodeError:
-                        logger.error("Failed to parse JSON response")
-                else:
-                    logger.error(f"Failed to fetch announcements: HTTP {response.status_code}")
-                
-                # Move to next month
-                current_date = end_date + timedelta(days=1)
-                
-                # Add delay between requests to avoid rate limiting
-                time.sleep(1)
-                
-            except Exception as e:
-                logger.error(f"Error during API request: {str(e)}")
-                # Move to next month even if there's an error
-                current_date = current_date + timedelta(days=30)
+            # Calculate end date for this window (1 month from current_date or today)
+            end_date = min(current_date + timedelta(days=30), today)
+            windows.append((current_date, end_date))
+            current_date = end_date + timedelta(days=1)
+        
+        # The windows are independent, so fetch them concurrently with a small worker cap
+        infra_announcements = []
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [
+                executor.submit(_fetch_window, session, api_url, start_date, end_date)
+                for start_date, end_date in windows
+            ]
+            # Collect in window order so announcements with equal dates keep a stable order
+            for future in futures:
+                infra_announcements.extend(future.result())
         
         # Sort announcements by date (newest first)
         infra_announcements.sort(key=lambda x: x.date, reverse=True)
         
-        # Extract PDF content from announcements and further details
+        # Group announcements by attachment so a PDF shared by several filings is fetched once
+        announcements_by_url: Dict[str, List[BSEAnnouncement]] = {}
         for announcement in infra_announcements:
             if announcement.attachment_url:
-                try:
-                    logger.info(f"Extracting PDF content from {announcement.attachment_url}")
-                    # Use a 30-second timeout for PDF downloads
-                    pdf_response = requests.get(announcement.attachment_url, headers=headers, timeout=30)
-                    
-                    if pdf_response.status_code == 200:
-                        try:
-                            # Parse PDF content
-                            with io.BytesIO(pdf_response.content) as pdf_file:
-                                try:
-                                    pdf_reader = PyPDF2.PdfReader(pdf_file)
-                                    text = ""
-                                    for page in pdf_reader.pages:
-                                        page_text = page.extract_text()
-                                        if page_text:
-                                            text += page_text + "\n"
-                                    
-                                    # Store the PDF content
-                                    full_text = text[:1000] if text else ""
-                                    announcement.pdf_content = full_text
-                                    
-                                    # Set description from PDF content
-                                    announcement.description = full_text
-                                    
-                                    # Extract more details from full text content
-                                    combined_text = title + " " + company + " " + full_text
-                                    
-                                    # Try to extract location
-                                    if not announcement.location:
-                                        location = extract_location(combined_text)
-                                        announcement.location = location
-                                    
-                                    # Try to extract contract value
-                                    if not announcement.contract_value:
-                                        contract_value = extract_contract_value(combined_text)
-                                        announcement.contract_value = contract_value
-                                    
-                                    # Refine project type if needed
-                                    if announcement.project_type == "Infrastructure Project" or not announcement.project_type:
-                                        refined_type = extract_project_type(combined_text)
-                                        if refined_type != "Infrastructure Project":
-                                            announcement.project_type = refined_type
-                                    
-                                except Exception as e:
-                                    logger.error(f"Error parsing PDF: {str(e)}")
-                        except Exception as e:
-                            logger.error(f"Error reading PDF content: {str(e)}")
-                    else:
-                        logger.error(f"Failed to download PDF: HTTP {pdf_response.status_code}")
-                except Exception as e:
-                    logger.error(f"Error downloading PDF: {str(e)}")
+                announcements_by_url.setdefault(announcement.attachment_url, []).append(announcement)
+        
+        # Extract PDF content from announcements and further details concurrently
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            futures = [
+                executor.submit(_fetch_and_parse, url, url_announcements, session)
+                for url, url_announcements in announcements_by_url.items()
+            ]
+            for future in as_completed(futures):
+                future.result()
+        
+        session.close()
         
         # Convert to the new requested format
         formatted_announcements = []
@@ -581,13 +774,12 @@ def scrape_bse_announcements() -> List[Dict[str, Any]]:
         try:
             # Save to the same location as the original
             output_path = os.path.join(os.path.dirname(__file__), 'bse_announcements2.json')
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(
-                    formatted_announcements,
-                    f,
-                    indent=2,
-                    default=str
-                )
+            blob = orjson.dumps(formatted_announcements, option=orjson.OPT_INDENT_2)
+            # Write in one go to a temp file and swap it in so readers never see a partial file
+            tmp_path = output_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(blob)
+            os.replace(tmp_path, output_path)
             logger.info(f"Total infrastructure announcements found: {len(formatted_announcements)}")
             logger.info(f"Saved infrastructure announcements to {output_path}")
         except Exception as e:
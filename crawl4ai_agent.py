@@ -5,20 +5,44 @@ companies winning contracts in India that would require steel in their execution
 """
 import os
 import asyncio
+import aiohttp
 import json
+import orjson
 import re
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, NamedTuple, Iterable
 from dotenv import load_dotenv
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 import csv
 import importlib
 import sys
+import functools
+import itertools
+import difflib
+import random
+import tiktoken
+from urllib.parse import urljoin, urlparse
+from pathlib import Path
 
 # Import Crawl4AI components
-from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode, LLMConfig
+from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode, LLMConfig, MemoryAdaptiveDispatcher, RateLimiter
 from crawl4ai.extraction_strategy import LLMExtractionStrategy, JsonCssExtractionStrategy
-from playwright.async_api import Page, BrowserContext
+from playwright.async_api import Page, BrowserContext, TimeoutError as PlaywrightTimeoutError
+
+# Gemini chat model used for extraction
+from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain.schema import HumanMessage, SystemMessage
+from google.api_core import exceptions as google_exceptions
+
+# Content-addressable cache for Gemini extraction results
+import extraction_cache
+
+# Use uvloop's faster event loop where it is installed (it isn't available on Windows)
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
 
 # Load environment variables
 load_dotenv()
@@ -29,6 +53,116 @@ for var in required_env_vars:
     if not os.getenv(var):
         raise ValueError(f"{var} is not set. Please add it to your .env file.")
 
+# Set DEBUG=1 in the environment for verbose diagnostic output
+DEBUG = os.getenv("DEBUG", "").lower() in ("1", "true", "yes")
+
+# Maximum number of browser pages open at the same time
+CRAWL_CONCURRENCY = 8
+
+# Pause the dispatcher from opening new pages above this share of system memory
+CRAWL_MEMORY_THRESHOLD_PERCENT = 80.0
+
+# Maximum number of sources per search waiting on Gemini extraction at the same time
+EXTRACTION_CONCURRENCY = 5
+
+# Maximum number of keyword searches sent to Google at the same time
+GOOGLE_SEARCH_CONCURRENCY = 3
+
+# Per-domain backoff when a source answers 429 Too Many Requests or 503 Service Unavailable
+RATE_LIMIT_BASE_DELAY = (1.0, 3.0)
+RATE_LIMIT_MAX_DELAY = 30.0
+RATE_LIMIT_RETRIES = 3
+RATE_LIMIT_CODES = [429, 503]
+
+# Extra rounds for pages that failed for any other reason (timeouts, navigation
+# errors), and extra attempts for Gemini calls that fail with a transient error
+CRAWL_RETRIES = 1
+API_RETRIES = 3
+
+# Errors worth retrying after a backoff, rather than giving up on the call
+TRANSIENT_ERRORS = (
+    TimeoutError,
+    ConnectionError,
+    aiohttp.ClientError,
+    google_exceptions.ResourceExhausted,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.InternalServerError
+)
+
+# Gemini extraction settings; bump the prompt version whenever the prompt changes
+GEMINI_MODEL = "gemini-2.0-flash"
+EXTRACTION_PROMPT_VERSION = "3"
+
+# Static extraction instructions, kept ahead of all per-call content so the
+# provider can reuse the identical prompt prefix across calls
+EXTRACTION_SYSTEM_PROMPT = """
+Extract information about companies winning contracts in India that would require steel.
+Focus on contracts related to infrastructure, construction, railways, highways, metros, buildings, etc.
+
+The user message holds one or more sources, each wrapped in a <<<SOURCE_N url=... date_range=...>>>
+header and a <<<END_N>>> marker. Contract news must be from within the date_range of its source.
+
+For each relevant contract news article, extract the following in JSON format:
+{
+    "title": "The title of the news article",
+    "company": "The name of the company that won the contract",
+    "project_type": "The type of project (infrastructure, railway, highway, etc.)",
+    "location": "The location in India where the project will be executed",
+    "contract_value": "The value of the contract if available",
+    "date_published": "The date when the news was published (YYYY-MM-DD format)",
+    "source_index": The number N of the <<<SOURCE_N ...>>> block the news was found in,
+    "source_url": "The url given in that source's header",
+    "description": "A brief description of the project and contract"
+}
+
+IMPORTANT:
+- Only extract news about contract wins, not general industry news
+- Focus on projects that would require steel in their execution
+- Consider ALL types of construction, infrastructure, and manufacturing projects as potential steel consumers
+- Include projects involving buildings, transportation, energy, water, manufacturing facilities, oil & gas, etc.
+- When in doubt about steel requirements, include the contract rather than exclude it
+- If you can't find all the information, provide as much as you can
+- Format dates as YYYY-MM-DD
+- Return the data from ALL sources as a single JSON array of objects, even if there's only one item
+- If no relevant news is found, return an empty array []
+"""
+
+# Schema Gemini's JSON mode constrains every reply to: an array of news objects
+EXTRACTION_RESPONSE_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "title": {"type": "string"},
+            "company": {"type": "string"},
+            "project_type": {"type": "string"},
+            "location": {"type": "string"},
+            "contract_value": {"type": "string", "nullable": True},
+            "date_published": {"type": "string"},
+            "source_index": {"type": "integer"},
+            "source_url": {"type": "string"},
+            "description": {"type": "string"}
+        },
+        "required": ["title", "company", "project_type", "location", "date_published", "source_index", "description"]
+    }
+}
+
+# Extra attempts, with the parse error fed back to Gemini, when a reply isn't a usable JSON array
+# (rare with JSON mode; mostly replies truncated at the output token limit)
+EXTRACTION_RETRIES = 2
+
+# Sources extracted concurrently are sent to Gemini together, up to this many per call;
+# a partial batch is sent once its first source has waited EXTRACTION_BATCH_WAIT seconds
+EXTRACTION_BATCH_SIZE = 4
+EXTRACTION_BATCH_WAIT = 2.0
+
+# Total content tokens per Gemini call, split evenly across the sources in a batch
+EXTRACTION_TOKEN_LIMIT = 12000
+
+# tiktoken encoding used to count content tokens; not Gemini's tokenizer, but close enough to budget with
+TOKEN_ENCODING_NAME = "cl100k_base"
+
 # Data models
 class ContractNews(BaseModel):
     """Model for contract news data."""
@@ -46,260 +180,752 @@ class SearchResult(BaseModel):
     keyword: str
     results: List[ContractNews]
 
-async def search_news_with_crawl4ai(keyword: str = None, days_back: int = 30, source_type: str = "all") -> List[ContractNews]:
+# Column headers shared by every contract news CSV
+CSV_HEADER = [
+    "Title", 
+    "Company", 
+    "Project Type", 
+    "Location", 
+    "Contract Value", 
+    "Date Published", 
+    "Source URL", 
+    "Description"
+]
+
+def contract_news_row(item: ContractNews) -> tuple:
+    """Return the CSV row for a news item, in CSV_HEADER order."""
+    return (
+        item.title,
+        item.company,
+        item.project_type,
+        item.location,
+        item.contract_value,
+        item.date_published,
+        item.source_url,
+        item.description
+    )
+
+# (normalized title, date published) of news the qualification pipeline has already processed,
+# with the date each was first seen
+SEEN_NEWS_FILE = "seen_news.json"
+SEEN_NEWS_RETENTION_DAYS = 90
+
+def seen_news_key(item: ContractNews) -> str:
+    """Return the key a news item is recorded under in the seen news file."""
+    return f"{normalize_title(item.title)}|{item.date_published}"
+
+def _load_seen_news(filename: str) -> Dict[str, str]:
+    """Load the news keys seen by earlier runs, or an empty dict if there are none yet."""
+    try:
+        with open(filename, "rb") as f:
+            return orjson.loads(f.read())
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        return {}
+
+def _save_seen_news(filename: str, seen_news: Dict[str, str]):
+    """Persist the seen news keys atomically, dropping ones older than the retention window."""
+    cutoff = (datetime.now() - timedelta(days=SEEN_NEWS_RETENTION_DAYS)).strftime("%Y-%m-%d")
+    recent = {key: first_seen for key, first_seen in seen_news.items() if first_seen >= cutoff}
+    tmp_path = f"{filename}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(recent))
+        os.replace(tmp_path, filename)
+    except OSError as e:
+        print(f"Could not save seen news: {str(e)}")
+
+def mark_news_seen(keys: Iterable[str], filename: str = SEEN_NEWS_FILE):
     """
-    Search for contract news using Crawl4AI.
+    Record news as processed, so later crawls skip it.
+    
+    Called by the qualification pipeline once it has settled the items, not when they are
+    crawled, so an item whose qualification failed is offered again by the next run.
+    
+    Args:
+        keys: seen_news_key of each item that was qualified, rejected or found to be a duplicate
+        filename: Path of the seen news file
+    """
+    seen_news = _load_seen_news(filename)
+    today = datetime.now().strftime("%Y-%m-%d")
+    for key in keys:
+        seen_news.setdefault(key, today)
+    _save_seen_news(filename, seen_news)
+
+class ContractNewsCSVSink:
+    """Append news items to a CSV file as each source finishes, skipping duplicates and news processed by earlier runs."""
+    
+    def __init__(self, filename: str, seen_news_file: str = SEEN_NEWS_FILE):
+        self.filename = filename
+        self.file = open(filename, "w", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(CSV_HEADER)
+        self.lock = asyncio.Lock()
+        # Only normalized titles are kept in memory, not the items themselves
+        self.seen_titles = set()
+        self.seen_news = _load_seen_news(seen_news_file)
+        self.count = 0
+        self.skipped = 0
+    
+    async def write(self, news_items: List[ContractNews]):
+        """Write the items not seen before and flush them to disk."""
+        async with self.lock:
+            rows = []
+            for item in news_items:
+                key = normalize_title(item.title)
+                if key in self.seen_titles:
+                    continue
+                self.seen_titles.add(key)
+                
+                # Skip articles the pipeline already processed in an earlier run
+                if seen_news_key(item) in self.seen_news:
+                    self.skipped += 1
+                    continue
+                rows.append(contract_news_row(item))
+            if rows:
+                self.writer.writerows(rows)
+                # Flush so rows survive a crash later in the run
+                self.file.flush()
+                self.count += len(rows)
+    
+    def close(self):
+        self.file.close()
+        print(f"Saved {self.count} news items to {self.filename} ({self.skipped} processed in earlier runs skipped)")
+
+class NewsSource(NamedTuple):
+    """A news source to crawl."""
+    name: str
+    url: str
+    type: str  # "news_site" or "search_engine"
+
+# Static news sites that don't require keywords
+STATIC_NEWS_SOURCES = (
+    NewsSource("Economic Times Infrastructure", "https://economictimes.indiatimes.com/industry/indl-goods/svs/construction/articlelist/13358759.cms", "news_site"),
+    NewsSource("Construction World", "https://www.constructionworld.in/latest-infrastructure-news", "news_site"),
+    NewsSource("Business Standard Infrastructure", "https://www.business-standard.com/industry/infrastructure", "news_site"),
+    NewsSource("BidDetail EPC", "https://www.biddetail.com/procurement-news/epc-contract", "news_site"),
+    NewsSource("News on Projects", "https://newsonprojects.com", "news_site"),
+    NewsSource("Construction Opportunities", "https://constructionopportunities.in/", "news_site"),
+    NewsSource("Project X India", "https://projectxindia.com", "news_site"),
+    NewsSource("Metro Rail Today", "https://metrorailtoday.com", "news_site"),
+    NewsSource("The Metro Rail Guy", "https://themetrorailguy.com", "news_site"),
+    NewsSource("Projects Today", "https://www.projectstoday.com", "news_site"),
+    NewsSource("Biltrax", "https://www.biltrax.com", "news_site")
+)
+
+def build_news_sources(keyword: str = None, source_type: str = "all") -> List[NewsSource]:
+    """
+    Build the list of news sources to crawl.
     
     Args:
         keyword: Search keyword (optional, only used for search engines)
-        days_back: Number of days back to search
         source_type: Type of source to search ("all", "news_site", or "search_engine")
     
     Returns:
-        List of contract news items
+        List of news sources
     """
-    print(f"Searching for news about: {keyword}")
-    
-    # Calculate date range for search
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=days_back)
-    date_range = f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}"
-    
     # List of news sources to search
     news_sources = []
     
     # Add sources based on type
     if source_type == "all" or source_type == "news_site":
-        # Static news sites that don't require keywords
-        news_sources.extend([
-            {
-                "name": "Economic Times Infrastructure",
-                "url": "https://economictimes.indiatimes.com/industry/indl-goods/svs/construction/articlelist/13358759.cms",
-                "type": "news_site"
-            },
-            {
-                "name": "Construction World",
-                "url": "https://www.constructionworld.in/latest-infrastructure-news",
-                "type": "news_site"
-            },
-            {
-                "name": "Business Standard Infrastructure",
-                "url": "https://www.business-standard.com/industry/infrastructure",
-                "type": "news_site"
-            },
-            {
-                "name": "BidDetail EPC",
-                "url": "https://www.biddetail.com/procurement-news/epc-contract",
-                "type": "news_site"
-            },
-            {
-                "name": "News on Projects",
-                "url": "https://newsonprojects.com",
-                "type": "news_site"
-            },
-            {
-                "name": "Construction Opportunities",
-                "url": "https://constructionopportunities.in/",
-                "type": "news_site"
-            },
-            {
-                "name": "Project X India",
-                "url": "https://projectxindia.com",
-                "type": "news_site"
-            },
-            {
-                "name": "Metro Rail Today",
-                "url": "https://metrorailtoday.com",
-                "type": "news_site"
-            },
-            {
-                "name": "The Metro Rail Guy",
-                "url": "https://themetrorailguy.com",
-                "type": "news_site"
-            },
-            {
-                "name": "Projects Today",
-                "url": "https://www.projectstoday.com",
-                "type": "news_site"
-            },
-            {
-                "name": "Biltrax",
-                "url": "https://www.biltrax.com",
-                "type": "news_site"
-            }
-        ])
+        news_sources.extend(STATIC_NEWS_SOURCES)
     
     # Add search engine if keyword is provided and source type is appropriate
     if keyword and (source_type == "all" or source_type == "search_engine"):
         # Add "latest" to the keyword for better results
         search_term = f"latest {keyword}"
         
-        news_sources.append({
-            "name": f"Google News Search - {keyword}",
-            "url": f"https://www.google.com/search?q={search_term}+contract+win+india&tbm=nws&tbs=qdr:m",
-            "type": "search_engine"
-        })
+        news_sources.append(NewsSource(
+            f"Google News Search - {keyword}",
+            f"https://www.google.com/search?q={search_term}+contract+win+india&tbm=nws&tbs=qdr:m",
+            "search_engine"
+        ))
     
-    if not news_sources:
-        return []
-        
+    return news_sources
+
+# Crawler run config shared by every crawl, without an extraction strategy
+CRAWLER_RUN_CONFIG = CrawlerRunConfig(
+    cache_mode=CacheMode.BYPASS,  # Always get fresh content
+    wait_for='body',  # Wait for body to load; lazy content is loaded in before_retrieve_html
+    stream=True,  # Yield each page as soon as it is crawled so extraction overlaps the remaining crawls
+)
+
+# CSS schemas for listing pages whose article cards have a stable DOM. The cards
+# are pulled out of the HTML directly, so Gemini only sees the compact card text.
+WORDPRESS_ARTICLE_SCHEMA = {
+    "name": "article",
+    "baseSelector": "article",
+    "fields": [
+        {"name": "title", "selector": ".entry-title a", "type": "text"},
+        {"name": "url", "selector": ".entry-title a", "type": "attribute", "attribute": "href"},
+        {"name": "date", "selector": "time", "type": "attribute", "attribute": "datetime"},
+        {"name": "snippet", "selector": ".entry-summary, .entry-content p", "type": "text"}
+    ]
+}
+
+LISTING_SCHEMAS = {
+    "economictimes.indiatimes.com": {
+        "name": "article",
+        "baseSelector": "div.eachStory",
+        "fields": [
+            {"name": "title", "selector": "h3 a", "type": "text"},
+            {"name": "url", "selector": "h3 a", "type": "attribute", "attribute": "href"},
+            {"name": "date", "selector": "time", "type": "text"},
+            {"name": "snippet", "selector": "p", "type": "text"}
+        ]
+    },
+    "www.business-standard.com": {
+        "name": "article",
+        "baseSelector": "div.cardlist",
+        "fields": [
+            {"name": "title", "selector": "h2 a, a.smallcard-title", "type": "text"},
+            {"name": "url", "selector": "h2 a, a.smallcard-title", "type": "attribute", "attribute": "href"},
+            {"name": "date", "selector": "span.date, div.listingstyle_timestamp", "type": "text"},
+            {"name": "snippet", "selector": "p", "type": "text"}
+        ]
+    },
+    "www.constructionworld.in": {
+        "name": "article",
+        "baseSelector": "div.news-list-item, div.listing-item",
+        "fields": [
+            {"name": "title", "selector": "h3 a, h2 a", "type": "text"},
+            {"name": "url", "selector": "h3 a, h2 a", "type": "attribute", "attribute": "href"},
+            {"name": "date", "selector": ".date", "type": "text"},
+            {"name": "snippet", "selector": "p", "type": "text"}
+        ]
+    },
+    "metrorailtoday.com": WORDPRESS_ARTICLE_SCHEMA,
+    "themetrorailguy.com": WORDPRESS_ARTICLE_SCHEMA
+}
+
+LISTING_STRATEGIES = {
+    host: JsonCssExtractionStrategy(schema) for host, schema in LISTING_SCHEMAS.items()
+}
+
+def extract_listing_cards(url: str, html: str) -> str:
+    """
+    Pull article cards out of a listing page with its CSS schema.
+    
+    Args:
+        url: URL of the listing page
+        html: HTML retrieved by the crawler
+    
+    Returns:
+        The cards as compact markdown, or an empty string if the source has no
+        schema or the schema no longer matches the page
+    """
+    strategy = LISTING_STRATEGIES.get(urlparse(url).netloc)
+    if strategy is None or not html:
+        return ""
+    
+    try:
+        cards = strategy.extract(url, html)
+    except Exception as e:
+        print(f"Error extracting article cards from {url}: {str(e)}")
+        return ""
+    
+    lines = []
+    for card in cards:
+        title = (card.get("title") or "").strip()
+        if not title:
+            continue
+        lines.append(f"## {title}")
+        if card.get("date"):
+            lines.append(f"Date: {card['date'].strip()}")
+        if card.get("url"):
+            lines.append(f"URL: {urljoin(url, card['url'].strip())}")
+        if card.get("snippet"):
+            lines.append(card["snippet"].strip())
+        lines.append("")
+    return "\n".join(lines)
+
+# Clicks every expand button on the page and returns how many were clicked
+CLICK_MORE_BUTTONS_JS = """
+() => {
+    const buttons = Array.from(document.querySelectorAll('button'))
+        .filter(b => /view more|load more|show more/i.test(b.textContent));
+    buttons.forEach(b => b.click());
+    return buttons.length;
+}
+"""
+
+# Longest time to wait for a page's network to go idle after scrolling
+NETWORK_IDLE_TIMEOUT_MS = 5000
+
+async def scroll_and_settle(page: Page):
+    """Scroll to the bottom once and return as soon as the page stops loading."""
+    await page.evaluate("window.scrollTo(0, document.body.scrollHeight);")
+    try:
+        await page.wait_for_load_state("networkidle", timeout=NETWORK_IDLE_TIMEOUT_MS)
+    except PlaywrightTimeoutError:
+        # Pages with polling or ads may never go idle; take what has loaded
+        pass
+
+# Hosts whose result pages are server-rendered and paginated, so scrolling and
+# "more" buttons load nothing and the page can be read as soon as it has loaded
+NO_INTERACTION_HOSTS = {"www.google.com"}
+
+# Resource types that only cost bandwidth, since extraction works from the HTML
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+
+# Hook functions for better page interaction
+async def block_heavy_resources(route):
+    """Abort requests whose content never reaches the extracted markdown."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def on_page_context_created(page: Page, context: BrowserContext, **kwargs):
+    print("[HOOK] Setting up page & context")
+    # Set a larger viewport for better rendering
+    await page.set_viewport_size({"width": 1920, "height": 1080})
+    # Don't download images, media, fonts or stylesheets
+    await context.route("**/*", block_heavy_resources)
+    return page
+
+async def after_goto(page: Page, context: BrowserContext, url: str, response, **kwargs):
+    print(f"[HOOK] Successfully loaded: {url}")
+    # Google News results are already limited to the past month by tbs=qdr:m in the URL,
+    # so there is no need to open the search tools and pick a date filter here
+    return page
+
+async def before_retrieve_html(page: Page, context: BrowserContext, **kwargs):
+    print("[HOOK] Performing final actions before retrieving HTML")
+    if urlparse(page.url).hostname in NO_INTERACTION_HOSTS:
+        return page
+    
+    # Scroll to the bottom to trigger lazy loading, then wait for the network to settle
+    await scroll_and_settle(page)
+    
+    # Try to expand any collapsed sections if they exist, clicking every
+    # "View More" / "Load More" button in one in-page call
+    clicked = 0
+    try:
+        clicked = await page.evaluate(CLICK_MORE_BUTTONS_JS)
+    except Exception as e:
+        print(f"[HOOK] Error expanding content: {str(e)}")
+    
+    # Scroll again after expanding
+    if clicked:
+        await scroll_and_settle(page)
+    
+    return page
+
+# ETag / Last-Modified of each static source from its last crawl, plus the cache key of its extraction
+SOURCE_VALIDATORS_FILE = "source_etag.json"
+HEAD_REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=10)
+
+def _load_source_validators() -> Dict[str, Dict[str, str]]:
+    """Load the stored source validators, or an empty dict if there are none yet."""
+    try:
+        with open(SOURCE_VALIDATORS_FILE, "rb") as f:
+            return orjson.loads(f.read())
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        return {}
+
+def _save_source_validators(validators: Dict[str, Dict[str, str]]):
+    """Persist the source validators atomically."""
+    tmp_path = f"{SOURCE_VALIDATORS_FILE}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(validators, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_path, SOURCE_VALIDATORS_FILE)
+    except OSError as e:
+        print(f"Could not save source validators: {str(e)}")
+
+async def check_source_unchanged(session: aiohttp.ClientSession, url: str, validator: Dict[str, str]) -> Tuple[bool, Dict[str, str]]:
+    """
+    Send a conditional HEAD request for a source.
+    
+    Args:
+        session: HTTP session used for the HEAD request
+        url: URL of the source
+        validator: ETag / Last-Modified stored from the previous crawl
+    
+    Returns:
+        Whether the page is unchanged, and its current ETag / Last-Modified
+        (empty if the server provides neither or the request failed)
+    """
+    headers = {}
+    if validator.get("etag"):
+        headers["If-None-Match"] = validator["etag"]
+    if validator.get("last_modified"):
+        headers["If-Modified-Since"] = validator["last_modified"]
+    
+    try:
+        async with session.head(url, headers=headers, allow_redirects=True) as response:
+            if response.status == 304:
+                return True, {"etag": validator.get("etag", ""), "last_modified": validator.get("last_modified", "")}
+            
+            current = {
+                "etag": response.headers.get("ETag", ""),
+                "last_modified": response.headers.get("Last-Modified", "")
+            }
+            if not current["etag"] and not current["last_modified"]:
+                return False, {}
+            # Some servers ignore conditional headers but still return a stable ETag
+            unchanged = response.status == 200 and bool(current["etag"]) and current["etag"] == validator.get("etag")
+            return unchanged, current
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        print(f"HEAD request for {url} failed, crawling anyway: {str(e)}")
+        return False, {}
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with jitter for the given retry attempt (1 for the first retry)."""
+    return 2 ** (attempt - 1) + random.random()
+
+async def _with_retry(call, attempts: int = API_RETRIES + 1):
+    """Await call() until it succeeds, backing off between attempts on transient errors only."""
+    for attempt in range(attempts):
+        try:
+            return await call()
+        except TRANSIENT_ERRORS as e:
+            if attempt == attempts - 1:
+                raise
+            delay = backoff_delay(attempt + 1)
+            print(f"Transient error ({type(e).__name__}), retrying in {delay:.1f}s: {str(e)}")
+            await asyncio.sleep(delay)
+
+def create_dispatcher() -> MemoryAdaptiveDispatcher:
+    """Create the dispatcher that paces one batch of concurrent page fetches."""
+    return MemoryAdaptiveDispatcher(
+        memory_threshold_percent=CRAWL_MEMORY_THRESHOLD_PERCENT,
+        max_session_permit=CRAWL_CONCURRENCY,
+        rate_limiter=RateLimiter(
+            base_delay=RATE_LIMIT_BASE_DELAY,
+            max_delay=RATE_LIMIT_MAX_DELAY,
+            max_retries=RATE_LIMIT_RETRIES,
+            rate_limit_codes=RATE_LIMIT_CODES
+        )
+    )
+
+def create_crawler() -> AsyncWebCrawler:
+    """Create a crawler with the page hooks attached, to be entered once with `async with`."""
     # Configure browser
     browser_config = BrowserConfig(
         headless=True,
         verbose=True,
     )
     
-    # Create crawler run config without extraction strategy initially
-    crawler_config = CrawlerRunConfig(
-        cache_mode=CacheMode.BYPASS,  # Always get fresh content
-        wait_for='body',  # Wait for body to load
-        js_code="""
-        // Wait for the page to load and scroll down to make sure all content is loaded
-        function waitForElement(selector, timeout = 30000) {
-            return new Promise((resolve, reject) => {
-                const startTime = Date.now();
-                const checkElement = () => {
-                    const element = document.querySelector(selector);
-                    if (element) {
-                        resolve(element);
-                    } else if (Date.now() - startTime > timeout) {
-                        reject(new Error(`Timeout waiting for ${selector}`));
-                    } else {
-                        setTimeout(checkElement, 500);
-                    }
-                };
-                checkElement();
-            });
-        }
-        
-        // Wait for page content to load
-        await waitForElement('body');
-        
-        // Scroll down to load all content
-        for (let i = 0; i < 5; i++) {
-            window.scrollBy(0, window.innerHeight);
-            await new Promise(r => setTimeout(r, 1000));
-        }
-        
-        // Wait a bit for any lazy-loaded content
-        await new Promise(r => setTimeout(r, 2000));
-        """
-    )
+    crawler = AsyncWebCrawler(config=browser_config)
     
-    # Create and run the crawler with hooks for better page loading
-    async with AsyncWebCrawler(config=browser_config) as crawler:
-        # Define hook functions for better page interaction
-        async def on_page_context_created(page: Page, context: BrowserContext, **kwargs):
-            print("[HOOK] Setting up page & context")
-            # Set a larger viewport for better rendering
-            await page.set_viewport_size({"width": 1920, "height": 1080})
-            return page
+    # Attach hooks to the crawler
+    crawler.crawler_strategy.set_hook("on_page_context_created", on_page_context_created)
+    crawler.crawler_strategy.set_hook("after_goto", after_goto)
+    crawler.crawler_strategy.set_hook("before_retrieve_html", before_retrieve_html)
+    return crawler
+
+async def search_news_with_crawl4ai(crawler: AsyncWebCrawler, keyword: str = None, days_back: int = 30, source_type: str = "all", sink: Optional[ContractNewsCSVSink] = None) -> List[ContractNews]:
+    """
+    Search for contract news using Crawl4AI.
+    
+    Args:
+        crawler: Started crawler shared by every search (see create_crawler)
+        keyword: Search keyword (optional, only used for search engines)
+        days_back: Number of days back to search
+        source_type: Type of source to search ("all", "news_site", or "search_engine")
+        sink: Optional CSV sink that each source's items are written to as soon as they are extracted
+    
+    Returns:
+        List of contract news items
+    """
+    print(f"Searching for news about: {keyword}")
+    
+    # Calculate date range for search
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=days_back)
+    date_range = f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}"
+    
+    news_sources = build_news_sources(keyword, source_type)
+    if not news_sources:
+        return []
+    
+    # Static sites are checked with a conditional HEAD before a browser page is opened
+    gate_sources = any(source.type == "news_site" for source in news_sources)
+    validators = _load_source_validators() if gate_sources else {}
+    
+    async def reuse_unchanged_source(source: NewsSource, head_session: aiohttp.ClientSession) -> Tuple[Optional[List[ContractNews]], Dict[str, str]]:
+        """Return last run's extraction if the page is unchanged, plus the page's current validator."""
+        if source.type != "news_site":
+            return None, {}
+        previous_validator = validators.get(source.url, {})
+        unchanged, current_validator = await check_source_unchanged(head_session, source.url, previous_validator)
+        if unchanged and previous_validator.get("cache_key"):
+            return _read_extraction_cache(previous_validator["cache_key"]), current_validator
+        return None, current_validator
+    
+    async with aiohttp.ClientSession(timeout=HEAD_REQUEST_TIMEOUT) as head_session:
+        gate_results = await asyncio.gather(
+            *(reuse_unchanged_source(source, head_session) for source in news_sources),
+            return_exceptions=True
+        )
+    
+    all_results = []
+    url_to_source = {}
+    current_validators = {}
+    for source, gate_result in zip(news_sources, gate_results):
+        if isinstance(gate_result, BaseException):
+            print(f"Error checking {source.name}: {str(gate_result)}")
+            gate_result = (None, {})
+        cached_items, current_validators[source.url] = gate_result
+        if cached_items is None:
+            url_to_source[source.url] = source
+            continue
         
-        async def after_goto(page: Page, context: BrowserContext, url: str, response, **kwargs):
-            print(f"[HOOK] Successfully loaded: {url}")
+        # Reuse last run's extraction since the page hasn't changed since
+        print(f"{source.name} is unchanged, reusing {len(cached_items)} extracted items")
+        if cached_items and sink is not None:
+            await sink.write(cached_items)
+        all_results.extend(cached_items)
+    
+    # Limit how many sources wait on Gemini at once, to stay within its rate limit
+    extraction_semaphore = asyncio.Semaphore(EXTRACTION_CONCURRENCY)
+    
+    async def extract_source(source: NewsSource, result) -> List[ContractNews]:
+        async with extraction_semaphore:
+            return await _extract_source(source, result)
+    
+    async def _extract_source(source: NewsSource, result) -> List[ContractNews]:
+        try:
+            # Prefer the article cards matched by the source's CSS schema,
+            # falling back to the full page markdown for other sources
+            content = extract_listing_cards(source.url, result.html) or result.markdown
+            if not content:
+                print(f"No content retrieved from {source.name}")
+                return []
             
-            # Handle Google News search specifically
-            if "google.com/search" in url:
-                try:
-                    print("[HOOK] Handling Google News search...")
-                    
-                    # Wait for search results to load
-                    await page.wait_for_selector('div[role="main"]', timeout=30000)
-                    
-                    # If there's a Tools button, click it to access date filters
-                    tools_button = await page.query_selector('div[aria-label="Search tools"]')
-                    if tools_button:
-                        await tools_button.click()
-                        await page.wait_for_timeout(1000)
-                        
-                        # Look for time filter dropdown
-                        time_filter = await page.query_selector('div[aria-label="Recent"]')
-                        if time_filter:
-                            await time_filter.click()
-                            await page.wait_for_timeout(1000)
-                            
-                            # Select "Past month" or similar option
-                            past_month = await page.query_selector('div[aria-label="Past month"]')
-                            if past_month:
-                                await past_month.click()
-                                await page.wait_for_timeout(2000)
-                except Exception as e:
-                    print(f"[HOOK] Error handling Google News: {str(e)}")
+            print(f"Successfully retrieved content from {source.name}")
             
-            return page
-        
-        async def before_retrieve_html(page: Page, context: BrowserContext, **kwargs):
-            print("[HOOK] Performing final actions before retrieving HTML")
+            # Use Gemini to extract structured data from the content
+            extracted_items = await extract_with_gemini(
+                content, 
+                keyword, 
+                source.url, 
+                date_range
+            )
             
-            # Scroll to make sure all content is loaded
-            for i in range(5):
-                await page.evaluate(f"window.scrollBy(0, {i * 500});")
-                await page.wait_for_timeout(500)
+            # Remember the page version and where its extraction is cached
+            if current_validators.get(source.url):
+                validators[source.url] = {
+                    **current_validators[source.url],
+                    "cache_key": _extraction_cache_key(_condense_markdown(content), source.url, date_range)
+                }
             
-            # Wait for a moment to let any lazy-loaded content appear
-            await page.wait_for_timeout(2000)
+            if extracted_items:
+                print(f"Found {len(extracted_items)} news items from {source.name}")
+                if sink is not None:
+                    await sink.write(extracted_items)
+                return extracted_items
+            print(f"No relevant news items found in {source.name}")
+            return []
+        except Exception as e:
+            print(f"Error extracting from {source.name}: {str(e)}")
+            return []
+    
+    if url_to_source:
+        for source in url_to_source.values():
+            print(f"Crawling {source.name} at {source.url}")
+        
+        # Fetch every page concurrently; the dispatcher limits open pages by free
+        # memory and backs off per domain on 429/503 responses. Each page is handed
+        # to Gemini as soon as it arrives rather than after the whole batch.
+        extraction_tasks = []
+        crawl_urls = list(url_to_source)
+        for attempt in range(CRAWL_RETRIES + 1):
+            # Pages that failed are crawled again after a backoff; the rest are never re-fetched
+            if attempt:
+                print(f"Retrying {len(crawl_urls)} sources that failed to crawl")
+                await asyncio.sleep(backoff_delay(attempt))
             
-            # Try to expand any collapsed sections if they exist
+            pending_urls = set(crawl_urls)
+            failed_urls = []
             try:
-                # Look for "View More" or "Load More" buttons
-                more_buttons = await page.query_selector_all('button:text-matches("View More|Load More|Show More")')
-                for button in more_buttons:
-                    await button.click()
-                    await page.wait_for_timeout(1000)  # Wait a bit after clicking
+                async for result in await crawler.arun_many(
+                    urls=crawl_urls,
+                    config=CRAWLER_RUN_CONFIG,
+                    dispatcher=create_dispatcher()
+                ):
+                    if result.url not in pending_urls:
+                        continue
+                    pending_urls.discard(result.url)
+                    source = url_to_source[result.url]
+                    if not result.success:
+                        print(f"Error crawling {source.name}: {result.error_message}")
+                        failed_urls.append(result.url)
+                        continue
+                    extraction_tasks.append(asyncio.create_task(extract_source(source, result)))
             except Exception as e:
-                print(f"[HOOK] Error expanding content: {str(e)}")
-            
-            # Scroll again after expanding
-            await page.evaluate("window.scrollTo(0, document.body.scrollHeight);")
-            await page.wait_for_timeout(1000)
+                print(f"Error crawling news sources: {str(e)}")
             
-            return page
+            # Sources the crawler never returned are retried along with the failed ones
+            crawl_urls = failed_urls + list(pending_urls)
+            if not crawl_urls:
+                break
         
-        # Attach hooks to the crawler
-        crawler.crawler_strategy.set_hook("on_page_context_created", on_page_context_created)
-        crawler.crawler_strategy.set_hook("after_goto", after_goto)
-        crawler.crawler_strategy.set_hook("before_retrieve_html", before_retrieve_html)
+        for url in crawl_urls:
+            print(f"No content retrieved from {url_to_source[url].name}")
         
-        all_results = []
-        
-        # Crawl each news source
-        for source in news_sources:
-            print(f"Crawling {source['name']} at {source['url']}")
-            try:
-                # Run the crawler on the current source
-                result = await crawler.arun(url=source['url'], config=crawler_config)
-                
-                # Get the markdown content
-                if result.markdown:
-                    print(f"Successfully retrieved content from {source['name']}")
-                    
-                    # Use Gemini to extract structured data from the markdown
-                    extracted_items = await extract_with_gemini(
-                        result.markdown, 
-                        keyword, 
-                        source['url'], 
-                        date_range
-                    )
-                    
-                    if extracted_items:
-                        print(f"Found {len(extracted_items)} news items from {source['name']}")
-                        all_results.extend(extracted_items)
-                    else:
-                        print(f"No relevant news items found in {source['name']}")
-                else:
-                    print(f"No content retrieved from {source['name']}")
-                    
-            except Exception as e:
-                print(f"Error crawling {source['name']}: {str(e)}")
-            
-            # Add delay between crawling different sources
-            if source != news_sources[-1]:
-                print("Waiting 5 seconds before crawling next source...")
-                await asyncio.sleep(5)
+        # Wait for the remaining extractions, taking results as each source finishes
+        for extraction in asyncio.as_completed(extraction_tasks):
+            all_results.extend(await extraction)
+    
+    if gate_sources:
+        _save_source_validators(validators)
     
     print(f"Total news items found: {len(all_results)}")
     return all_results
 
+async def search_keyword(crawler: AsyncWebCrawler, keyword: str, semaphore: asyncio.Semaphore, sink: Optional[ContractNewsCSVSink] = None) -> List[ContractNews]:
+    """Search Google News for one keyword once a slot in the semaphore is free."""
+    async with semaphore:
+        # Search for contract news using only search engines
+        return await search_news_with_crawl4ai(crawler, keyword, source_type="search_engine", sink=sink)
+
+# Patterns used to strip page boilerplate from markdown before it is sent to Gemini
+MARKDOWN_IMAGE_PATTERN = re.compile(r'!\[[^\]]*\]\([^)]*\)')
+# Gemini reports the source header URL, so links are reduced to their text
+MARKDOWN_LINK_PATTERN = re.compile(r'\[([^\]]*)\]\([^)]*\)')
+# Whole nav-link lines ("Home", "About Us", "Privacy Policy") and copyright lines; only
+# lines shorter than MAX_BOILERPLATE_LINE_LENGTH are checked, so news text is never dropped
+BOILERPLATE_LINE_PATTERN = re.compile(
+    r'^\W*(?:(?:home|about(?: us)?|contact(?: us)?|subscribe|log ?in|log ?out|sign ?(?:in|up|out)'
+    r'|privacy(?: policy)?|terms(?: of (?:use|service)| (?:and|&) conditions)?|cookies?(?: policy)?)\W*'
+    r'|(?:©|copyright\b).*|.*\ball rights reserved\b\W*)$',
+    re.IGNORECASE
+)
+MAX_BOILERPLATE_LINE_LENGTH = 80
+INFORMATIVE_LINE_PATTERN = re.compile(r'\d{4}|http|Rs|crore|contract', re.IGNORECASE)
+EXTRA_BLANK_LINES_PATTERN = re.compile(r'\n{3,}')
+MIN_INFORMATIVE_LINE_LENGTH = 40
+
+def _condense_markdown(markdown_content: str) -> str:
+    """Drop images, link URLs and nav/footer lines, keeping headings and lines that look like news content."""
+    markdown_content = MARKDOWN_IMAGE_PATTERN.sub('', markdown_content)
+    markdown_content = MARKDOWN_LINK_PATTERN.sub(r'\1', markdown_content)
+    lines = [
+        line for line in markdown_content.split('\n')
+        if not line.strip()
+        or line.startswith('#')
+        or (
+            not (len(line) < MAX_BOILERPLATE_LINE_LENGTH and BOILERPLATE_LINE_PATTERN.match(line))
+            and (len(line) >= MIN_INFORMATIVE_LINE_LENGTH or INFORMATIVE_LINE_PATTERN.search(line))
+        )
+    ]
+    return EXTRA_BLANK_LINES_PATTERN.sub('\n\n', '\n'.join(lines)).strip()
+
+@functools.lru_cache(maxsize=None)
+def _token_encoding() -> tiktoken.Encoding:
+    """Load the token encoding on first use (tiktoken may need to download it)."""
+    return tiktoken.get_encoding(TOKEN_ENCODING_NAME)
+
+def _truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text down to at most max_tokens tokens."""
+    # Every token covers at least one byte, so short text can't be over budget
+    if len(text.encode("utf-8")) <= max_tokens:
+        return text
+    tokens = _token_encoding().encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return _token_encoding().decode(tokens[:max_tokens])
+
+# Words that show up around contract-win news; pages with fewer than
+# MIN_CONTRACT_KEYWORD_HITS of them are not sent to Gemini at all
+CONTRACT_KEYWORD_PATTERN = re.compile(r'\b(?:contracts?|orders?|awarded|bags|bagged|wins?|won|LoA|EPC|crores?|tenders?|bids?)\b', re.IGNORECASE)
+MIN_CONTRACT_KEYWORD_HITS = 3
+
+def _has_contract_keywords(markdown_content: str) -> bool:
+    """Check whether the content mentions contract wins often enough to be worth extracting."""
+    hits = itertools.islice(CONTRACT_KEYWORD_PATTERN.finditer(markdown_content), MIN_CONTRACT_KEYWORD_HITS)
+    return sum(1 for _ in hits) == MIN_CONTRACT_KEYWORD_HITS
+
+def _token_count(text: str) -> int:
+    """Count the tokens in text."""
+    return len(_token_encoding().encode(text, disallowed_special=()))
+
+def _split_token_budget(contents: List[str], total_tokens: int) -> List[int]:
+    """
+    Split a token budget across several contents without wasting it on short ones.
+    
+    Contents shorter than an even share keep all their tokens, and what they
+    leave unused is shared among the longer ones.
+    
+    Returns:
+        The token limit of each content, in input order
+    """
+    sizes = [_token_count(content) for content in contents]
+    limits = [0] * len(contents)
+    remaining = total_tokens
+    # Hand out budget shortest first so every leftover flows to the longer contents
+    order = sorted(range(len(contents)), key=sizes.__getitem__)
+    for position, index in enumerate(order):
+        limits[index] = min(sizes[index], remaining // (len(order) - position))
+        remaining -= limits[index]
+    return limits
+
+def _extraction_cache_key(markdown_content: str, source_url: str, date_range: str) -> str:
+    """Hash the provider, model, prompt version and prompt inputs into a cache key."""
+    return extraction_cache.make_key("gemini", GEMINI_MODEL, EXTRACTION_PROMPT_VERSION, source_url, date_range, markdown_content)
+
+def _read_extraction_cache(key: str) -> Optional[List[ContractNews]]:
+    """Return cached extraction results, or None on a miss or an unusable entry."""
+    rows = extraction_cache.get(key)
+    if rows is None:
+        return None
+    try:
+        return [ContractNews.model_validate(row) for row in rows]
+    except (ValidationError, TypeError) as e:
+        # Outdated entry; evict it so the content is extracted again
+        print(f"Discarding extraction cache entry {key}: {str(e)}")
+        extraction_cache.evict(key)
+        return None
+
+def _write_extraction_cache(key: str, news_items: List[ContractNews]):
+    """Store extraction results along with the model and prompt version that produced them."""
+    extraction_cache.set(
+        key,
+        [item.model_dump() for item in news_items],
+        model=GEMINI_MODEL,
+        prompt_version=EXTRACTION_PROMPT_VERSION
+    )
+
+# ```json ... ``` fence wrapped around a whole Gemini reply
+CODE_FENCE_PATTERN = re.compile(r'^```(?:json)?\s*|\s*```$', re.IGNORECASE)
+
+# Candidate starts of the JSON array in a Gemini reply
+JSON_ARRAY_START_PATTERN = re.compile(r'\[')
+
+def _parse_json_array(response_text: str) -> List[Dict[str, Any]]:
+    """
+    Parse the JSON array of news objects out of a Gemini reply.
+    
+    Raises:
+        ValueError: If the reply contains no JSON array of objects
+    """
+    # Strip a fence around the whole reply so fenced JSON still takes the fast path
+    text = CODE_FENCE_PATTERN.sub('', response_text.strip())
+    try:
+        data = orjson.loads(text)
+    except orjson.JSONDecodeError:
+        # The reply has prose around the JSON; decode from each
+        # opening bracket in turn, letting the decoder find where the array ends
+        decoder = json.JSONDecoder()
+        data = None
+        for match in JSON_ARRAY_START_PATTERN.finditer(text):
+            try:
+                data, _ = decoder.raw_decode(text, match.start())
+            except json.JSONDecodeError:
+                continue
+            if isinstance(data, list) and all(isinstance(item, dict) for item in data):
+                break
+            data = None
+        if data is None:
+            raise ValueError("No JSON array found in response")
+    
+    if not isinstance(data, list) or not all(isinstance(item, dict) for item in data):
+        raise ValueError("Response is not a JSON array of objects")
+    return data
+
 async def extract_with_gemini(markdown_content: str, keyword: str, source_url: str, date_range: str) -> List[ContractNews]:
     """
     Extract contract news from markdown content using Gemini.
@@ -313,389 +939,412 @@ async def extract_with_gemini(markdown_content: str, keyword: str, source_url: s
     Returns:
         List of contract news items
     """
-    from langchain_google_genai import ChatGoogleGenerativeAI
-    from langchain.schema import HumanMessage
+    # Strip boilerplate first so it neither costs tokens nor changes the cache key
+    markdown_content = _condense_markdown(markdown_content)
+    
+    # Pages with no sign of contract news would only cost a Gemini call to return []
+    if not _has_contract_keywords(markdown_content):
+        print(f"No contract keywords in {source_url}, skipping extraction")
+        return []
+    
+    # Skip the Gemini call entirely if this exact content was extracted before
+    cache_key = _extraction_cache_key(markdown_content, source_url, date_range)
+    cached_items = _read_extraction_cache(cache_key)
+    if cached_items is not None:
+        print(f"Using cached extraction for {source_url}")
+        return cached_items
     
-    # Create Gemini model
-    model = ChatGoogleGenerativeAI(
-        model="gemini-2.0-flash-exp",
+    # Share the Gemini call with other sources being extracted at the same time
+    return await extraction_batcher.extract(markdown_content, source_url, date_range, cache_key)
+
+@functools.lru_cache(maxsize=1)
+def _gemini_model() -> ChatGoogleGenerativeAI:
+    """Create the Gemini chat model on first use and share it across calls."""
+    return ChatGoogleGenerativeAI(
+        model=GEMINI_MODEL,
         api_key=os.environ.get("GEMINI_API_KEY"),
         temperature=0.2,
+        # A single attempt per call; transient errors are retried by _with_retry
+        max_retries=1,
+        # Structured output: the reply is the JSON array itself, with no prose to strip
+        response_mime_type="application/json",
+        response_schema=EXTRACTION_RESPONSE_SCHEMA,
     )
+
+async def _extract_batch_with_gemini(batch: List[tuple]) -> List[List[ContractNews]]:
+    """
+    Extract contract news for several sources with a single Gemini call.
+    
+    Args:
+        batch: (markdown_content, source_url, date_range, cache_key) for each source
     
-    # Create extraction prompt
-    prompt = f"""
-    Extract information about companies winning contracts in India that would require steel.
-    Focus on contracts related to infrastructure, construction, railways, highways, metros, buildings, etc.
-    
-    The contract news must be from within this date range: {date_range}
-    
-    For each relevant contract news article, extract the following in JSON format:
-    {{
-        "title": "The title of the news article",
-        "company": "The name of the company that won the contract",
-        "project_type": "The type of project (infrastructure, railway, highway, etc.)",
-        "location": "The location in India where the project will be executed",
-        "contract_value": "The value of the contract if available",
-        "date_published": "The date when the news was published (YYYY-MM-DD format)",
-        "source_url": "{source_url}",
-        "description": "A brief description of the project and contract"
-    }}
-    
-    IMPORTANT:
-    - Only extract news about contract wins, not general industry news
-    - Focus on projects that would require steel in their execution
-    - Consider ALL types of construction, infrastructure, and manufacturing projects as potential steel consumers
-    - Include projects involving buildings, transportation, energy, water, manufacturing facilities, oil & gas, etc.
-    - When in doubt about steel requirements, include the contract rather than exclude it
-    - If you can't find all the information, provide as much as you can
-    - Format dates as YYYY-MM-DD
-    - Return the data as a JSON array of objects, even if there's only one item
-    - If no relevant news is found, return an empty array []
-    
-    Here's the content to extract from:
-    
-    {markdown_content[:50000]}  # Limit content length to avoid token limits
+    Returns:
+        The contract news items of each source, in batch order
     """
+    model = _gemini_model()
     
-    try:
-        # Call Gemini to extract structured data
-        response = await model.ainvoke([HumanMessage(content=prompt)])
+    # Only the dynamic inputs go into the user message, after the static system prompt
+    token_limits = _split_token_budget([markdown_content for markdown_content, _, _, _ in batch], EXTRACTION_TOKEN_LIMIT)
+    user_payload = "\n".join(
+        f"<<<SOURCE_{index} url={source_url} date_range={date_range}>>>\n"
+        f"{_truncate_to_tokens(markdown_content, token_limit)}\n"
+        f"<<<END_{index}>>>"
+        for index, ((markdown_content, source_url, date_range, _), token_limit) in enumerate(zip(batch, token_limits))
+    )
+    source_urls = [source_url for _, source_url, _, _ in batch]
+    
+    messages = [
+        SystemMessage(content=EXTRACTION_SYSTEM_PROMPT),
+        HumanMessage(content=user_payload)
+    ]
+    
+    for attempt in range(EXTRACTION_RETRIES + 1):
+        try:
+            # Call Gemini to extract structured data
+            response = await _with_retry(lambda: model.ainvoke(messages))
+        except Exception as e:
+            print(f"Error extracting with Gemini: {str(e)}")
+            return [[] for _ in batch]
         
         # Parse the response
-        response_text = response.content
-        
-        # Extract JSON from the response
-        import re
-        import json
-        
-        # Look for JSON array in the response
-        json_match = re.search(r'\[\s*\{.*?\}\s*\]', response_text, re.DOTALL)
-        if json_match:
-            json_str = json_match.group(0)
-            try:
-                extracted_data = json.loads(json_str)
-                
-                # Convert to ContractNews objects
-                result = []
-                for item in extracted_data:
-                    try:
-                        # Ensure required fields are present
-                        if not all(k in item for k in ["title", "company", "project_type", "location", "date_published", "description"]):
-                            print(f"Skipping incomplete item: {item}")
-                            continue
-                        
-                        # Create ContractNews object
-                        news_item = ContractNews(
-                            title=item["title"],
-                            company=item["company"],
-                            project_type=item["project_type"],
-                            location=item["location"],
-                            contract_value=item.get("contract_value", "N/A"),
-                            date_published=item["date_published"],
-                            source_url=item.get("source_url", source_url),
-                            description=item["description"]
-                        )
-                        
-                        result.append(news_item)
-                    except Exception as e:
-                        print(f"Error processing news item: {str(e)}")
+        try:
+            extracted_data = _parse_json_array(response.content)
+            break
+        except ValueError as e:
+            if attempt == EXTRACTION_RETRIES:
+                print(f"Failed to parse JSON from response: {str(e)}")
+                if len(batch) == 1:
+                    return [[]]
                 
-                return result
-            except json.JSONDecodeError:
-                print("Failed to parse JSON from response")
-                return []
-        else:
-            print("No JSON array found in response")
-            return []
-    except Exception as e:
-        print(f"Error extracting with Gemini: {str(e)}")
-        return []
+                # The combined reply is unusable; extract each source on its own instead
+                print(f"Extracting {len(batch)} sources separately")
+                results = await asyncio.gather(*(_extract_batch_with_gemini([request]) for request in batch))
+                return [result[0] for result in results]
+            
+            # Show Gemini its own reply and the error, and ask again
+            print(f"Retrying extraction for {', '.join(source_urls)}: {str(e)}")
+            messages = messages + [
+                response,
+                HumanMessage(content=f"Your output had a JSON parsing error: {str(e)}. Fix it and return ONLY a JSON array.")
+            ]
+            await asyncio.sleep(1.0 * (attempt + 1))
+    
+    # Convert to ContractNews objects, grouped by the source they came from
+    results = [[] for _ in batch]
+    for item in extracted_data:
+        try:
+            # Ensure required fields are present
+            if not all(k in item for k in ["title", "company", "project_type", "location", "date_published", "description"]):
+                print(f"Skipping incomplete item: {item}")
+                continue
+            
+            index = item.get("source_index")
+            if not isinstance(index, int) or not 0 <= index < len(batch):
+                if len(batch) == 1:
+                    index = 0
+                elif item.get("source_url") in source_urls:
+                    index = source_urls.index(item["source_url"])
+                else:
+                    print(f"Skipping item with unknown source: {item['title']}")
+                    continue
+            
+            # Create ContractNews object
+            news_item = ContractNews(
+                title=item["title"],
+                company=item["company"],
+                project_type=item["project_type"],
+                location=item["location"],
+                contract_value=item.get("contract_value", "N/A"),
+                date_published=item["date_published"],
+                source_url=item.get("source_url", source_urls[index]),
+                description=item["description"]
+            )
+            
+            results[index].append(news_item)
+        except Exception as e:
+            print(f"Error processing news item: {str(e)}")
+    
+    # Cache each source under its own key so later runs can hit it individually
+    for (_, _, _, cache_key), result in zip(batch, results):
+        _write_extraction_cache(cache_key, result)
+    return results
+
+class GeminiExtractionBatcher:
+    """Collect extraction requests from concurrent crawls and send them to Gemini in small batches."""
+    
+    def __init__(self, batch_size: int = EXTRACTION_BATCH_SIZE, max_wait: float = EXTRACTION_BATCH_WAIT):
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.pending = []
+        self.flush_handle = None
+        # Keep references to running batches so they aren't garbage collected
+        self.tasks = set()
+    
+    async def extract(self, markdown_content: str, source_url: str, date_range: str, cache_key: str) -> List[ContractNews]:
+        """Queue one source for extraction and wait for its share of the batch result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.append(((markdown_content, source_url, date_range, cache_key), future))
+        
+        if len(self.pending) >= self.batch_size:
+            self._flush()
+        elif self.flush_handle is None:
+            self.flush_handle = loop.call_later(self.max_wait, self._flush)
+        return await future
+    
+    def _flush(self):
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+        batch, self.pending = self.pending, []
+        if batch:
+            task = asyncio.create_task(self._run(batch))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+    
+    async def _run(self, batch: List[tuple]):
+        try:
+            results = await _extract_batch_with_gemini([request for request, _ in batch])
+        except Exception as e:
+            print(f"Error extracting with Gemini: {str(e)}")
+            results = [[] for _ in batch]
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+extraction_batcher = GeminiExtractionBatcher()
 
 def save_contract_news_to_csv(news_items: List[ContractNews], filename: str = "contract_news.csv"):
     """Save contract news to a CSV file."""
-    import csv
-    
     # Debug: Print URLs before saving
-    print(f"\nVerifying source URLs before saving to {filename}:")
-    for i, item in enumerate(news_items[:5]):  # Just show first 5 for brevity
-        print(f"  Item {i+1}: {item.title[:30]}... -> URL: {item.source_url}")
-    if len(news_items) > 5:
-        print(f"  ... and {len(news_items)-5} more items")
-    
-    # Write to CSV file
-    with open(filename, "w", newline="", encoding="utf-8") as f:
+    if DEBUG:
+        print(f"\nVerifying source URLs before saving to {filename}:")
+        for i, item in enumerate(news_items[:5]):  # Just show first 5 for brevity
+            print(f"  Item {i+1}: {item.title[:30]}... -> URL: {item.source_url}")
+        if len(news_items) > 5:
+            print(f"  ... and {len(news_items)-5} more items")
+    
+    # Write to CSV file through a 1 MiB buffer
+    with open(filename, "w", newline="", encoding="utf-8", buffering=1 << 20) as f:
         writer = csv.writer(f)
         
         # Write header
-        writer.writerow([
-            "Title", 
-            "Company", 
-            "Project Type", 
-            "Location", 
-            "Contract Value", 
-            "Date Published", 
-            "Source URL", 
-            "Description"
-        ])
+        writer.writerow(CSV_HEADER)
         
-        # Write data
-        for item in news_items:
-            writer.writerow([
-                item.title,
-                item.company,
-                item.project_type,
-                item.location,
-                item.contract_value,
-                item.date_published,
-                item.source_url,
-                item.description
-            ])
+        # Write data in one call so the csv module loops in C
+        writer.writerows(contract_news_row(item) for item in news_items)
     
     print(f"Saved {len(news_items)} news items to {filename}")
 
-def read_csv_to_contract_news(filename: str) -> List[ContractNews]:
-    """Read a CSV file and convert to ContractNews objects."""
-    news_items = []
-    
+# ContractNews field for each CSV_HEADER column
+CSV_FIELDS = ("title", "company", "project_type", "location", "contract_value", "date_published", "source_url", "description")
+
+def read_csv_rows(filename: str) -> List[tuple]:
+    """Read the rows of a contract news CSV file as tuples in CSV_HEADER order."""
     try:
-        with open(filename, "r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                try:
-                    news_item = ContractNews(
-                        title=row["Title"],
-                        company=row["Company"],
-                        project_type=row["Project Type"],
-                        location=row["Location"],
-                        contract_value=row["Contract Value"],
-                        date_published=row["Date Published"],
-                        source_url=row["Source URL"],
-                        description=row["Description"]
-                    )
-                    news_items.append(news_item)
-                except Exception as e:
-                    print(f"Error converting row to ContractNews: {str(e)}")
-    except Exception as e:
+        with open(filename, "r", newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return []
+            # Pick the columns by name so files with extra or reordered columns still line up
+            columns = [header.index(column) for column in CSV_HEADER]
+            return [tuple(row[column] for column in columns) for row in reader if len(row) == len(header)]
+    except (OSError, ValueError) as e:
         print(f"Error reading CSV file {filename}: {str(e)}")
-        
-    return news_items
+        return []
+
+# Fuzzy title matching: titles are reduced to letters and digits, and only compared
+# with earlier titles sharing their first FUZZY_BUCKET_PREFIX characters
+FUZZY_TITLE_PATTERN = re.compile(r'[^a-z0-9]+')
+FUZZY_BUCKET_PREFIX = 6
+FUZZY_MATCH_RATIO = 0.85
+MIN_CONTAINED_TITLE_LENGTH = 20
+
+def _is_fuzzy_duplicate(fuzzy_key: str, fuzzy_buckets: Dict[str, List[str]]) -> bool:
+    """Check a reduced title against the earlier ones in its bucket for containment or a close match."""
+    # b is the side SequenceMatcher indexes, so it stays fixed while a varies
+    matcher = difflib.SequenceMatcher(None, b=fuzzy_key)
+    for other in fuzzy_buckets.get(fuzzy_key[:FUZZY_BUCKET_PREFIX], ()):
+        # One title is the other with extra words, e.g. a source name or location appended
+        shorter, longer = sorted((fuzzy_key, other), key=len)
+        if len(shorter) >= MIN_CONTAINED_TITLE_LENGTH and shorter in longer:
+            return True
+        matcher.set_seq1(other)
+        # The quick ratios are upper bounds of ratio(), so most pairs are rejected cheaply
+        if (
+            matcher.real_quick_ratio() >= FUZZY_MATCH_RATIO
+            and matcher.quick_ratio() >= FUZZY_MATCH_RATIO
+            and matcher.ratio() >= FUZZY_MATCH_RATIO
+        ):
+            return True
+    return False
 
 def merge_contract_news_files(output_file: str, input_files: List[str]) -> List[ContractNews]:
     """Merge multiple CSV files of contract news into one, removing duplicates."""
-    all_news = []
+    all_rows = []
     seen_titles = set()
+    fuzzy_buckets = {}
     
     # Read each input file
     for filename in input_files:
-        if os.path.exists(filename):
-            news_items = read_csv_to_contract_news(filename)
-            print(f"Read {len(news_items)} items from {filename}")
-            
-            # Add unique items
-            for item in news_items:
-                if item.title not in seen_titles:
-                    seen_titles.add(item.title)
-                    all_news.append(item)
+        if not Path(filename).is_file():
+            continue
+        rows = read_csv_rows(filename)
+        print(f"Read {len(rows)} items from {filename}")
+        
+        # Add unique rows, comparing normalized titles so case, spacing and quote variants
+        # collapse, then fuzzily so "Rs 500 cr" / "₹500 crore" rewordings do too
+        for row in rows:
+            key = normalize_title(row[0])
+            if key in seen_titles:
+                continue
+            seen_titles.add(key)
+            fuzzy_key = FUZZY_TITLE_PATTERN.sub(' ', key).strip()
+            if _is_fuzzy_duplicate(fuzzy_key, fuzzy_buckets):
+                continue
+            fuzzy_buckets.setdefault(fuzzy_key[:FUZZY_BUCKET_PREFIX], []).append(fuzzy_key)
+            all_rows.append(row)
     
-    # Save merged results
-    if all_news:
-        save_contract_news_to_csv(all_news, output_file)
-        print(f"Merged {len(all_news)} unique items to {output_file}")
+    # Save merged results; the rows were validated when they were first written,
+    # so they are copied across without a round trip through ContractNews
+    if all_rows:
+        with open(output_file, "w", newline="", encoding="utf-8", buffering=1 << 20) as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_HEADER)
+            writer.writerows(all_rows)
+        print(f"Merged {len(all_rows)} unique items to {output_file}")
     
-    return all_news
+    return [ContractNews.model_construct(**dict(zip(CSV_FIELDS, row))) for row in all_rows]
 
-def run_bse_scrapers():
-    """Run both BSE scrapers and save results to separate CSV files."""
-    results = []
-    
-    # Check if BSE scraper modules exist
-    if os.path.exists("bse_scraper.py"):
-        print("\nRunning BSE Scraper 1...")
-        try:
-            # Import the module
-            sys.path.append(os.getcwd())
-            bse_scraper = importlib.import_module("bse_scraper")
-            
-            # Run the scraper
-            announcements = bse_scraper.scrape_bse_announcements()
-            
-            # Debug: Print first few announcements to see their structure
-            if announcements:
-                print(f"\nReceived {len(announcements)} announcements from BSE Scraper 1")
-                print("Sample announcement structure:")
-                sample = announcements[0] if announcements else {}
-                
-                # Print the raw announcement
-                print(f"Raw announcement: {type(sample)}")
-                if hasattr(sample, '__dict__'):
-                    print(json.dumps(sample.__dict__, indent=2, default=str))
-                else:
-                    print(json.dumps(sample, indent=2, default=str))
-            
-            # Convert to ContractNews and save
-            if announcements:
-                news_items = []
-                for ann in announcements:
-                    try:
-                        # Handle both dictionary and object responses
-                        if hasattr(ann, '__dict__'):
-                            # It's an object, convert to dict
-                            ann_dict = ann.__dict__
-                            # Check if we need to convert from BSEAnnouncement model
-                            title = getattr(ann, 'title', None)
-                            company = getattr(ann, 'company', None)
-                            project_type = getattr(ann, 'project_type', None)
-                            location = getattr(ann, 'location', None)
-                            contract_value = getattr(ann, 'contract_value', None)
-                            date_obj = getattr(ann, 'date', None)
-                            description = getattr(ann, 'pdf_content', getattr(ann, 'description', None))
-                            attachment_url = getattr(ann, 'attachment_url', None)
-                        else:
-                            # It's already a dictionary - handle the exact JSON structure 
-                            # from the example
-                            title = ann.get("Title", ann.get("title", ""))
-                            company = ann.get("Company", ann.get("company", ""))
-                            project_type = ann.get("Project Type", ann.get("project_type", "Infrastructure"))
-                            location = ann.get("Location", ann.get("location", "India"))
-                            contract_value = ann.get("Contract Value", ann.get("contract_value", "Not specified"))
-                            date_obj = ann.get("Date", ann.get("date", None))
-                            description = ann.get("Description", ann.get("description", ""))
-                            # Get attachment URL directly from the key used in the example
-                            attachment_url = ann.get("attachment_url", None)
-                        
-                        # Handle date formatting
-                        if isinstance(date_obj, datetime):
-                            date_str = date_obj.strftime("%Y-%m-%d")
-                        elif isinstance(date_obj, str):
-                            date_str = date_obj
-                        else:
-                            date_str = datetime.now().strftime("%Y-%m-%d")
-                        
-                        # Debug: Print attachment URL if found
-                        if attachment_url:
-                            print(f"Found attachment URL for {title[:50]}...: {attachment_url}")
-                            print(f"Description: {description[:100]}...")
-                        
-                        # Use attachment_url if available, otherwise fall back to default BSE URL
-                        source_url = attachment_url if attachment_url else "https://www.bseindia.com/corporates/ann.html"
-                        
-                        news_item = ContractNews(
-                            title=title or "",
-                            company=company or "",
-                            project_type=project_type or "Infrastructure",
-                            location=location or "India",
-                            contract_value=contract_value or "Not specified",
-                            date_published=date_str,
-                            source_url=source_url,
-                            description=description or ""
-                        )
-                        news_items.append(news_item)
-                    except Exception as e:
-                        print(f"Error converting BSE announcement to ContractNews: {str(e)}")
-                        print(f"Problematic announcement: {ann}")
-                
-                # Save to CSV
-                save_contract_news_to_csv(news_items, "bse_scraper1_results.csv")
-                print(f"Saved {len(news_items)} items from BSE Scraper 1")
-                results.append("bse_scraper1_results.csv")
-        except Exception as e:
-            print(f"Error running BSE Scraper 1: {str(e)}")
-    
-    # Run BSE Scraper 2
-    if os.path.exists("bse_scraper2.py"):
-        print("\nRunning BSE Scraper 2...")
-        try:
-            # Import the module
-            sys.path.append(os.getcwd())
-            bse_scraper2 = importlib.import_module("bse_scraper2")
-            
-            # Run the scraper
-            announcements = bse_scraper2.scrape_bse_announcements()
-            
-            # Debug: Print first few announcements to see their structure
-            if announcements:
-                print(f"\nReceived {len(announcements)} announcements from BSE Scraper 2")
-                print("Sample announcement structure:")
-                sample = announcements[0] if announcements else {}
-                
-                # Print the raw announcement
-                print(f"Raw announcement: {type(sample)}")
-                if hasattr(sample, '__dict__'):
-                    print(json.dumps(sample.__dict__, indent=2, default=str))
-                else:
-                    print(json.dumps(sample, indent=2, default=str))
-            
-            # Convert to ContractNews and save
-            if announcements:
-                news_items = []
-                for ann in announcements:
-                    try:
-                        # Handle both dictionary and object responses
-                        if hasattr(ann, '__dict__'):
-                            # It's an object, convert to dict
-                            ann_dict = ann.__dict__
-                            # Check if we need to convert from BSEAnnouncement model
-                            title = getattr(ann, 'title', None)
-                            company = getattr(ann, 'company', None)
-                            project_type = getattr(ann, 'project_type', None)
-                            location = getattr(ann, 'location', None)
-                            contract_value = getattr(ann, 'contract_value', None)
-                            date_obj = getattr(ann, 'date', None)
-                            description = getattr(ann, 'pdf_content', getattr(ann, 'description', None))
-                            attachment_url = getattr(ann, 'attachment_url', None)
-                        else:
-                            # It's already a dictionary - handle the exact JSON structure 
-                            # from the example
-                            title = ann.get("Title", ann.get("title", ""))
-                            company = ann.get("Company", ann.get("company", ""))
-                            project_type = ann.get("Project Type", ann.get("project_type", "Infrastructure"))
-                            location = ann.get("Location", ann.get("location", "India"))
-                            contract_value = ann.get("Contract Value", ann.get("contract_value", "Not specified"))
-                            date_obj = ann.get("Date", ann.get("date", None))
-                            description = ann.get("Description", ann.get("description", ""))
-                            # Get attachment URL directly from the key used in the example
-                            attachment_url = ann.get("attachment_url", None)
-                        
-                        # Handle date formatting
-                        if isinstance(date_obj, datetime):
-                            date_str = date_obj.strftime("%Y-%m-%d")
-                        elif isinstance(date_obj, str):
-                            date_str = date_obj
-                        else:
-                            date_str = datetime.now().strftime("%Y-%m-%d")
-                        
-                        # Debug: Print attachment URL if found
-                        if attachment_url:
-                            print(f"Found attachment URL for {title[:50]}...: {attachment_url}")
-                            print(f"Description: {description[:100]}...")
-                        
-                        # Use attachment_url if available, otherwise fall back to default BSE URL
-                        source_url = attachment_url if attachment_url else "https://www.bseindia.com/corporates/ann.html"
-                        
-                        news_item = ContractNews(
-                            title=title or "",
-                            company=company or "",
-                            project_type=project_type or "Infrastructure",
-                            location=location or "India",
-                            contract_value=contract_value or "Not specified",
-                            date_published=date_str,
-                            source_url=source_url,
-                            description=description or ""
-                        )
-                        news_items.append(news_item)
-                    except Exception as e:
-                        print(f"Error converting BSE announcement to ContractNews: {str(e)}")
-                        print(f"Problematic announcement: {ann}")
-                
-                # Save to CSV
-                save_contract_news_to_csv(news_items, "bse_scraper2_results.csv")
-                print(f"Saved {len(news_items)} items from BSE Scraper 2")
-                results.append("bse_scraper2_results.csv")
-        except Exception as e:
-            print(f"Error running BSE Scraper 2: {str(e)}")
+# Where each ContractNews field is found on a BSE announcement: the keys tried in
+# order on scraper dicts, or the attributes tried in order on announcement objects
+ANNOUNCEMENT_FIELDS = {
+    "title": ("Title", "title"),
+    "company": ("Company", "company"),
+    "project_type": ("Project Type", "project_type"),
+    "location": ("Location", "location"),
+    "contract_value": ("Contract Value", "contract_value"),
+    "date": ("Date", "date"),
+    "description": ("Description", "pdf_content", "description"),
+    "attachment_url": ("attachment_url",)
+}
+# The snake_case names, which are the only ones that can be attributes
+ANNOUNCEMENT_ATTRIBUTES = {name for names in ANNOUNCEMENT_FIELDS.values() for name in names if name.islower()}
+
+def _announcement_fields(ann: Any) -> Dict[str, Any]:
+    """Read every ANNOUNCEMENT_FIELDS field off a BSE announcement dict or object in one pass."""
+    if isinstance(ann, dict):
+        values = ann
+    else:
+        values = {name: getattr(ann, name) for name in ANNOUNCEMENT_ATTRIBUTES if hasattr(ann, name)}
+    return {
+        field: next((values[name] for name in names if name in values), None)
+        for field, names in ANNOUNCEMENT_FIELDS.items()
+    }
+
+def _announcement_to_news(ann: Any) -> Optional[ContractNews]:
+    """Convert a BSE announcement (dict or object) to ContractNews, or None if it can't be converted."""
+    try:
+        fields = _announcement_fields(ann)
+        
+        # Handle date formatting
+        date_obj = fields["date"]
+        if isinstance(date_obj, datetime):
+            date_str = date_obj.strftime("%Y-%m-%d")
+        elif isinstance(date_obj, str):
+            date_str = date_obj
+        else:
+            date_str = datetime.now().strftime("%Y-%m-%d")
+        
+        title = fields["title"]
+        description = fields["description"]
+        attachment_url = fields["attachment_url"]
+        
+        # Debug: Print attachment URL if found
+        if attachment_url:
+            print(f"Found attachment URL for {title[:50]}...: {attachment_url}")
+            print(f"Description: {description[:100]}...")
+        
+        # Use attachment_url if available, otherwise fall back to default BSE URL
+        source_url = attachment_url if attachment_url else "https://www.bseindia.com/corporates/ann.html"
+        
+        return ContractNews(
+            title=title or "",
+            company=fields["company"] or "",
+            project_type=fields["project_type"] or "Infrastructure",
+            location=fields["location"] or "India",
+            contract_value=fields["contract_value"] or "Not specified",
+            date_published=date_str,
+            source_url=source_url,
+            description=description or ""
+        )
+    except Exception as e:
+        print(f"Error converting BSE announcement to ContractNews: {str(e)}")
+        print(f"Problematic announcement: {ann}")
+        return None
+
+@functools.lru_cache(maxsize=None)
+def _load_scraper(module_name: str):
+    """Import a scraper module from the working directory, once per process."""
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+    return importlib.import_module(module_name)
+
+def _run_one_bse(module_name: str, label: str, output_csv: str) -> Optional[str]:
+    """Run one BSE scraper module and save its results; return the CSV filename if anything was saved."""
+    # Check if the BSE scraper module exists
+    if not os.path.exists(f"{module_name}.py"):
+        return None
     
-    return results
+    print(f"\nRunning {label}...")
+    try:
+        # Import the module
+        bse_module = _load_scraper(module_name)
+        
+        # Run the scraper
+        announcements = bse_module.scrape_bse_announcements()
+        if not announcements:
+            return None
+        
+        # Debug: Print first announcement to see its structure
+        print(f"\nReceived {len(announcements)} announcements from {label}")
+        print("Sample announcement structure:")
+        sample = announcements[0]
+        
+        # Print the raw announcement
+        print(f"Raw announcement: {type(sample)}")
+        sample_fields = sample.__dict__ if hasattr(sample, '__dict__') else sample
+        print(orjson.dumps(sample_fields, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str).decode())
+        
+        # Convert to ContractNews and save
+        news_items = [news for news in map(_announcement_to_news, announcements) if news is not None]
+        save_contract_news_to_csv(news_items, output_csv)
+        print(f"Saved {len(news_items)} items from {label}")
+        return output_csv
+    except Exception as e:
+        print(f"Error running {label}: {str(e)}")
+        return None
+
+async def run_bse_scrapers() -> List[str]:
+    """Run both BSE scrapers concurrently and save results to separate CSV files."""
+    # Each scraper blocks (and BSE Scraper 1 runs its own event loop), so give each a thread
+    results = await asyncio.gather(
+        asyncio.to_thread(_run_one_bse, "bse_scraper", "BSE Scraper 1", "bse_scraper1_results.csv"),
+        asyncio.to_thread(_run_one_bse, "bse_scraper2", "BSE Scraper 2", "bse_scraper2_results.csv")
+    )
+    return [output_csv for output_csv in results if output_csv]
+
+# Trailing " - Economic Times" / " | Business Standard" style source names on titles
+TITLE_SOURCE_SUFFIX_PATTERN = re.compile(r'\s+[-|–]\s+[^-|–]*\b(?:times|standard|world|news|today)\b[^-|–]*$')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+# Curly quotes and primes mapped to their ASCII equivalents
+QUOTE_TRANSLATION = str.maketrans({"\u2018": "'", "\u2019": "'", "\u2032": "'", "\u201c": '"', "\u201d": '"', "\u2033": '"'})
+
+def normalize_title(title: str) -> str:
+    """Normalize a title for duplicate detection across sources."""
+    title = WHITESPACE_PATTERN.sub(' ', title.casefold().translate(QUOTE_TRANSLATION)).strip()
+    return TITLE_SOURCE_SUFFIX_PATTERN.sub('', title)
 
 def display_contract_news(news_items: List[ContractNews]):
     """Display contract news in a readable format."""
@@ -726,9 +1375,9 @@ async def main():
         print("that would require steel in their execution.")
         print("-------------------------------------------------------------------")
         
-        # Step 1: Run both BSE scrapers first
-        print("\nStep 1: Running BSE Scrapers...")
-        bse_result_files = run_bse_scrapers()
+        # Step 1: Start both BSE scrapers; they run in worker threads while Crawl4AI searches
+        print("\nStep 1: Starting BSE Scrapers...")
+        bse_task = asyncio.create_task(run_bse_scrapers())
         
         # Step 2: Run Crawl4AI
         print("\nStep 2: Running Crawl4AI search...")
@@ -762,29 +1411,29 @@ async def main():
             print(f"{i}) {keyword}")
         print()
         
-        # First, search static news sites once
-        print("Searching static news sites...")
-        all_news_items = await search_news_with_crawl4ai(source_type="news_site")
-        
-        # Then search Google News for each keyword
-        for keyword in keywords:
-            # Search for contract news using only search engines
-            news_items = await search_news_with_crawl4ai(keyword, source_type="search_engine")
-            
-            # Add to overall results
-            if news_items:
-                all_news_items.extend(news_items)
-        
-        # Deduplicate news items by title
-        unique_news_items = []
-        seen_titles = set()
-        for item in all_news_items:
-            if item.title not in seen_titles:
-                seen_titles.add(item.title)
-                unique_news_items.append(item)
+        # Stream Crawl4AI results to their own CSV as each source finishes
+        sink = ContractNewsCSVSink("crawl4ai_results.csv")
+        try:
+            # Launch the browser once and reuse it for every search
+            async with create_crawler() as crawler:
+                # Search the static news sites once, alongside Google News for all
+                # keywords, which is searched a few keywords at a time to avoid rate limits
+                print("Searching static news sites...")
+                google_semaphore = asyncio.Semaphore(GOOGLE_SEARCH_CONCURRENCY)
+                search_results = await asyncio.gather(
+                    search_news_with_crawl4ai(crawler, source_type="news_site", sink=sink),
+                    *(search_keyword(crawler, keyword, google_semaphore, sink) for keyword in keywords),
+                    return_exceptions=True
+                )
+                
+                for search_name, news_items in zip(["static news sites", *keywords], search_results):
+                    if isinstance(news_items, BaseException):
+                        print(f"Error searching for {search_name}: {str(news_items)}")
+        finally:
+            sink.close()
         
-        # Save Crawl4AI results to its own CSV
-        save_contract_news_to_csv(unique_news_items, "crawl4ai_results.csv")
+        # Wait for the BSE scrapers if they are still running
+        bse_result_files = await bse_task
         
         # Step 3: Merge all results
         print("\nStep 3: Merging all results...")
@@ -2,7 +2,8 @@
 Steel Contract News Qualification Pipeline
 
 This module implements a pipeline with two AI model tasks:
-1. Headline deduplication - Check if the news has been previously sent to the sales team
+1. Headline deduplication - Check if the news has been previously sent to the sales team;
+   borderline headlines are decided by the model in the same call as qualification
 2. Content qualification - Determine if the news is worth sending based on steel requirements 
    and potential for selling steel to the company in the news
 
@@ -10,12 +11,24 @@ Supports both DeepSeek R1 and Google Gemini models, with fallback logic.
 """
 
 import os
-import json
+import re
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+import random
+import orjson
+import zlib
 import asyncio
 import csv
+import io
+import itertools
 from datetime import datetime
-from typing import List, Dict, Any, Optional
-from pydantic import BaseModel
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple
+import aiofiles
+import aiohttp
+import numpy as np
+from pydantic import BaseModel, ConfigDict, ValidationInfo, field_validator
 
 # Try to use langchain's model integrations
 try:
@@ -30,13 +43,241 @@ try:
 except ImportError:
     GEMINI_AVAILABLE = False
 
-# Import ContractNews model from the crawl4ai_agent module
-from crawl4ai_agent import ContractNews
+# Import ContractNews model from the crawl4ai_agent module, along with the record of news
+# processed by earlier runs that the crawler skips
+from crawl4ai_agent import ContractNews, seen_news_key, mark_news_seen
+
+# Content-addressable cache shared with the crawler's Gemini extraction results
+import extraction_cache
+
+# Log records go through a queue and are written to the console by a background thread,
+# so concurrent workers never block the event loop on console output
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+logger.propagate = False
+_log_queue = queue.SimpleQueue()
+logger.addHandler(QueueHandler(_log_queue))
+_log_console = logging.StreamHandler()
+_log_console.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+_log_listener = QueueListener(_log_queue, _log_console)
+_log_listener.start()
+# Stopping the listener drains the queue, so nothing logged before exit is lost
+atexit.register(_log_listener.stop)
 
 # Configuration
-HEADLINES_FILE = "sent_headlines.json"
+HEADLINES_FILE = "sent_headlines.jsonl"  # One JSON string per line, appended to as news is sent
+LEGACY_HEADLINES_FILE = "sent_headlines.json"  # Previous format: a single JSON array, rewritten on every save
 QUALIFIED_NEWS_FILE = "qualified_news.csv"
 
+# Models behind each provider; cached qualifications are keyed by the model that answered
+DEEPSEEK_MODEL = "deepseek-reasoner"
+GEMINI_MODEL = "gemini-2.0-flash"
+GEMINI_DIRECT_MODEL = "gemini-pro"
+
+# Direct DeepSeek API, used when the LangChain clients are unavailable or fail
+DEEPSEEK_API_URL = "https://api.deepseek.com/v1/chat/completions"
+DIRECT_API_TIMEOUT = aiohttp.ClientTimeout(total=60)
+
+# Concurrent calls allowed per provider, across all items being processed
+PROVIDER_CONCURRENCY = {"deepseek": 8, "gemini": 16}
+
+# Retries with exponential backoff for rate-limited or failing provider calls,
+# before falling through to the next provider
+AI_CALL_RETRIES = 4
+AI_CALL_MAX_BACKOFF = 30.0
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+def _error_status(error: Exception) -> Optional[int]:
+    """Return the HTTP status of a provider error, whichever client library raised it."""
+    for attr in ("status", "status_code", "code"):
+        status = getattr(error, attr, None)
+        if isinstance(status, int):
+            return status
+    return None
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Return the Retry-After delay in seconds the provider sent with an error, if any."""
+    headers = getattr(error, "headers", None) or getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+# Columns of the qualified news CSV
+QUALIFIED_NEWS_HEADER = [
+    "Title", 
+    "Company", 
+    "Project Type", 
+    "Location", 
+    "Contract Value", 
+    "Date Published", 
+    "Tag",  # Combined Industry-SubCategory
+    "Steel Requirements",
+    "Potential Value",
+    "Target Company",
+    "Urgency",
+    "Reasoning"
+]
+
+# Fixed instructions for content qualification, sent as the system message of every
+# qualification call so only the short per-item user message changes between calls
+QUALIFICATION_SYSTEM_PROMPT = """
+You are a Steel Sales Lead Qualification System for a steel manufacturing company. Your task is to:
+1. Identify the industry and sub-category of the project
+2. Determine if the news article about a contract award or project is worth sending to our sales team for potential steel sales
+
+You need to evaluate the news article you are given to determine:
+1. Whether the project would require significant steel materials
+2. Whether we could potentially sell steel to the company mentioned in the news (not to the government)
+3. The specific potential steel requirements (types, quantities if mentioned)
+4. The urgency/timeline of the opportunity
+
+
+### ALLOWED TAGS:
+- `Automotive-Confirmed`  
+- `Automotive-Predictive_Alert`  
+- `Infrastructure-Contract_Won`  
+- `Infrastructure-Ongoing_Tender`  
+- `Realty-Announced`  
+- `Realty-Predictive_Alert`  
+- `Renewable_Energy-Contract_Won`  
+- `Renewable_Energy-Ongoing_Tender`  
+- `Renewable_Energy-Predictive_Alert` 
+
+
+Here are important criteria:
+- First identify the industry and sub-category from the options above
+- Government entities are **not** direct targets for steel sales
+- Small-scale IT or service contracts typically don't require significant steel
+- Construction, infrastructure, manufacturing, energy projects often need substantial steel
+- The contract value should be significant enough to indicate large material requirements
+- We want to focus on opportunities where the company (not the government) would be purchasing steel
+
+Provide your analysis in the following JSON format only:
+{
+    "qualified": true/false,
+    "tag": "Industry-SubCategory",  # MUST MATCH ALLOWED TAGS ABOVE
+    "sub_category": "Specific sub-category from the provided options",
+    "steel_requirements": "Detailed description of likely steel requirements",
+    "potential_value": "Estimated percentage of the contract value that might be spent on steel",
+    "target_company": "The specific company that would potentially purchase the steel",
+    "urgency": "high/medium/low",
+    "reasoning": "Your detailed reasoning including industry classification justification"
+}
+
+When previously sent headlines are listed after the article, also add "duplicate": true/false to the
+JSON: true if the article reports the same news event as any of those headlines (even if worded
+differently), false if it is news we haven't sent before. Duplicates are never qualified.
+
+Response MUST be valid JSON.
+"""
+
+class Qualification(BaseModel):
+    """Qualification verdict returned by the AI models; missing fields fall back to defaults."""
+    model_config = ConfigDict(extra="allow", coerce_numbers_to_str=True)
+    
+    qualified: bool = False
+    tag: str = ""
+    sub_category: str = ""
+    steel_requirements: str = ""
+    potential_value: str = ""
+    target_company: str = ""
+    urgency: str = ""
+    reasoning: str = ""
+    # Only set when the prompt listed previously sent headlines
+    duplicate: Optional[bool] = None
+    
+    @field_validator("*", mode="before")
+    @classmethod
+    def _null_to_default(cls, value: Any, info: ValidationInfo) -> Any:
+        """Treat JSON nulls as missing fields."""
+        return cls.model_fields[info.field_name].default if value is None else value
+
+# Number of workers qualifying news items at the same time
+PIPELINE_CONCURRENCY = 16
+
+# Unique news items waiting for a worker; reading the input pauses while the queue is full
+PIPELINE_QUEUE_SIZE = 1000
+
+# Qualified rows held in memory before they are written to the CSV in one go
+QUALIFIED_NEWS_WRITE_BATCH = 64
+
+# Write buffer for the qualified news CSV
+QUALIFIED_NEWS_BUFFER_SIZE = 1 << 20
+
+# Qualified rows waiting for the writer task; workers pause while the queue is full
+QUALIFIED_NEWS_QUEUE_SIZE = 2048
+
+# New headlines checked for duplicates together as they are read
+HEADLINE_BATCH_SIZE = 50
+
+# A headline that matches a sent one after normalization is a duplicate. The others are
+# compared locally as hashed character-trigram vectors: below the unique similarity a
+# headline is new, and at or above it the AI model decides in the qualification call,
+# against the HEADLINE_CONTEXT_SIZE most similar sent headlines. Trigram similarity alone
+# can't tell a reworded report from a different contract (another state or amount in the
+# same wording), so it never marks a headline as a duplicate by itself.
+HEADLINE_EMBEDDING_DIM = 4096
+HEADLINE_UNIQUE_SIMILARITY = 0.5
+HEADLINE_CONTEXT_SIZE = 10
+
+NON_ALPHANUMERIC_PATTERN = re.compile(r'[^a-z0-9]+')
+
+def _normalize_headline(headline: str) -> str:
+    """Lowercase a headline and reduce punctuation and whitespace to single spaces."""
+    return NON_ALPHANUMERIC_PATTERN.sub(' ', headline.lower()).strip()
+
+def _duplicate_cache_key(headline: str) -> str:
+    """Cache key for a headline the AI model judged to be a duplicate."""
+    return extraction_cache.make_key("headline_duplicate", _normalize_headline(headline))
+
+def embed_headlines(headlines: List[str]) -> np.ndarray:
+    """
+    Embed headlines as L2-normalized hashed character-trigram count vectors.
+    
+    Args:
+        headlines: The headlines to embed
+        
+    Returns:
+        Array of shape (len(headlines), HEADLINE_EMBEDDING_DIM); cosine similarity is a dot product
+    """
+    embeddings = np.zeros((len(headlines), HEADLINE_EMBEDDING_DIM), dtype=np.float32)
+    for row, headline in enumerate(headlines):
+        text = f" {_normalize_headline(headline)} "
+        # crc32 rather than hash(), which is salted differently in every process
+        columns = [zlib.crc32(text[i:i + 3].encode()) % HEADLINE_EMBEDDING_DIM for i in range(len(text) - 2)]
+        np.add.at(embeddings[row], columns, 1.0)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings / np.maximum(norms, 1e-12)
+
+# Keyword prefilter run before the qualification call. Items that mention nothing
+# steel-intensive and either look like a service contract or have a government body as
+# the company are rejected without calling the AI models; everything else goes to the model.
+STEEL_KEYWORD_PATTERN = re.compile(
+    r'\b(?:epc|bridges?|metro|ports?|highways?|expressways?|roads?|refiner(?:y|ies)|steel|towers?|plants?'
+    r'|rail(?:way)?s?|tunnels?|pipelines?|construction|infrastructure|solar|wind|vehicles?|automotive'
+    r'|buildings?|housing|realty|factor(?:y|ies)|manufacturing|transmission|substations?)\b',
+    re.IGNORECASE
+)
+NON_STEEL_KEYWORD_PATTERN = re.compile(
+    r'\b(?:software|consultancy|consulting|advisory|licen[cs]es?|subscriptions?|audits?|saas|cloud)\b',
+    re.IGNORECASE
+)
+GOVERNMENT_BUYER_PATTERN = re.compile(r'^\s*(?:government of|govt\.? of|ministry of|municipal|department of)', re.IGNORECASE)
+
+def prefilter_rejection(news: ContractNews) -> Optional[str]:
+    """Return the reason an item can be rejected without the AI models, or None if it needs qualifying."""
+    text = f"{news.title} {news.project_type} {news.description}"
+    if STEEL_KEYWORD_PATTERN.search(text):
+        return None
+    if NON_STEEL_KEYWORD_PATTERN.search(text):
+        return "Prefilter: service contract with no steel-intensive work mentioned"
+    if GOVERNMENT_BUYER_PATTERN.match(news.company or ""):
+        return "Prefilter: government buyer with no steel-intensive work mentioned"
+    return None
+
 class NewsQualificationPipeline:
     """Pipeline for processing contract news with AI models."""
     
@@ -54,126 +295,143 @@ class NewsQualificationPipeline:
         if not self.deepseek_api_key and not self.gemini_api_key:
             raise ValueError("Neither DeepSeek nor Gemini API keys are available")
         
-        # Log the API keys
-        print(f"DeepSeek API Key: {self.deepseek_api_key}")
-        print(f"Gemini API Key: {self.gemini_api_key}")
-
         self.headlines_file = HEADLINES_FILE
         self.qualified_news_file = QUALIFIED_NEWS_FILE
         
-        # Load previously sent headlines
+        # Load previously sent headlines, with their normalized forms and embeddings for the local duplicate check
         self.sent_headlines = self._load_sent_headlines()
+        self.sent_normalized_headlines = {_normalize_headline(headline) for headline in self.sent_headlines}
+        self.sent_headline_embeddings = embed_headlines(self.sent_headlines)
         
         # Initialize API clients
         self.deepseek = None
         self.gemini = None
+        # Same Gemini model constrained to JSON output, for the calls that expect JSON objects
+        self.gemini_json = None
+        # HTTP session for direct API calls, created on first use
+        self._http: Optional[aiohttp.ClientSession] = None
+        # Items rejected by the keyword prefilter in the current run
+        self.prefiltered = 0
+        # Caps on concurrent calls to each provider, shared by every item
+        self._provider_semaphores = {provider: asyncio.Semaphore(limit) for provider, limit in PROVIDER_CONCURRENCY.items()}
         
         # Try to initialize DeepSeek
         if self.deepseek_api_key and DEEPSEEK_AVAILABLE:
             try:
                 self.deepseek = ChatDeepSeek(
-                    model="deepseek-reasoner",
+                    model=DEEPSEEK_MODEL,
                     api_key=self.deepseek_api_key
                 )
-                print("DeepSeek model initialized successfully")
+                logger.info("DeepSeek model initialized successfully")
             except Exception as e:
-                print(f"Failed to initialize DeepSeek model: {e}")
+                logger.error(f"Failed to initialize DeepSeek model: {e}")
         
         # Try to initialize Gemini
         if self.gemini_api_key and GEMINI_AVAILABLE:
             try:
                 self.gemini = ChatGoogleGenerativeAI(
-                    model="gemini-2.0-flash",
+                    model=GEMINI_MODEL,
                     api_key=self.gemini_api_key,
                     temperature=0.2,
                 )
-                print("Gemini model initialized successfully")
+                self.gemini_json = ChatGoogleGenerativeAI(
+                    model=GEMINI_MODEL,
+                    api_key=self.gemini_api_key,
+                    temperature=0.2,
+                    response_mime_type="application/json",
+                )
+                logger.info("Gemini model initialized successfully")
             except Exception as e:
-                print(f"Failed to initialize Gemini model: {e}")
+                logger.error(f"Failed to initialize Gemini model: {e}")
                 
         if not self.deepseek and not self.gemini:
-            print("WARNING: No AI models available. Will use direct API calls.")
+            logger.warning("No AI models available. Will use direct API calls.")
     
     def _load_sent_headlines(self) -> List[str]:
-        """Load previously sent headlines from file."""
+        """Load previously sent headlines from file, migrating the old JSON array file if needed."""
         if not os.path.exists(self.headlines_file):
+            return self._migrate_legacy_headlines()
+        
+        headlines = []
+        with open(self.headlines_file, 'rb') as f:
+            for line in f:
+                try:
+                    headlines.append(orjson.loads(line))
+                except orjson.JSONDecodeError:
+                    # A line cut short by a crash mid-append; the rest of the file is still good
+                    if line.strip():
+                        logger.warning(f"Skipping unreadable line in {self.headlines_file}")
+        return headlines
+    
+    def _migrate_legacy_headlines(self) -> List[str]:
+        """Copy headlines from the old JSON array file into the JSONL file."""
+        if not os.path.exists(LEGACY_HEADLINES_FILE):
             return []
         
         try:
-            with open(self.headlines_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            print(f"Error loading headlines from {self.headlines_file}, starting with empty list")
+            with open(LEGACY_HEADLINES_FILE, 'rb') as f:
+                headlines = orjson.loads(f.read())
+        except orjson.JSONDecodeError:
+            logger.error(f"Error loading headlines from {LEGACY_HEADLINES_FILE}, starting with empty list")
             return []
+        
+        # Runs from __init__, before there is an event loop to write through
+        with open(self.headlines_file, 'ab') as f:
+            f.write(_headline_lines(headlines))
+        logger.info(f"Migrated {len(headlines)} headlines from {LEGACY_HEADLINES_FILE} to {self.headlines_file}")
+        return headlines
     
-    def _save_sent_headlines(self):
-        """Save sent headlines to file."""
-        with open(self.headlines_file, 'w', encoding='utf-8') as f:
-            json.dump(self.sent_headlines, f, ensure_ascii=False, indent=2)
+    def _similar_sent_headlines(self, headline: str) -> List[str]:
+        """Return the sent headlines most similar to a headline, most similar first."""
+        similarities = embed_headlines([headline])[0] @ self.sent_headline_embeddings.T
+        top = np.argsort(-similarities)[:HEADLINE_CONTEXT_SIZE]
+        return [self.sent_headlines[i] for i in top]
     
-    async def _check_headline_duplicate(self, headline: str) -> bool:
+    def _find_duplicate_headlines(self, headlines: List[str]) -> List[Optional[bool]]:
         """
-        Check if headline is a duplicate using AI.
+        Decide locally which headlines are duplicates of ones already sent.
+        
+        Exact matches of a sent headline after normalization are duplicates, clear misses
+        by trigram similarity are new, and borderline headlines already judged duplicates
+        by the AI model in earlier runs stay duplicates.
         
         Args:
-            headline: The headline to check
+            headlines: The headlines to check
             
         Returns:
-            True if duplicate, False otherwise
-        """
-        prompt = f"""
-        You are a news deduplication system. Your task is to check if a news headline is semantically similar 
-        to any headlines in our database of previously sent news.
-
-        Here are the previously sent headlines:
-        {json.dumps(self.sent_headlines, indent=2)}
-
-        New headline to check:
-        "{headline}"
-
-        Answer with EXACTLY ONE WORD: either "DUPLICATE" if this headline is semantically equivalent 
-        to any in the list (meaning it refers to the same news event, even if worded differently) 
-        or "UNIQUE" if it represents news we haven't seen before.
+            True for each duplicate headline, False for each new one and None for the
+            borderline ones the AI model has to decide, in input order
         """
+        if not self.sent_headlines:
+            return [False] * len(headlines)
         
-        result = await self._call_ai_model(prompt)
-        is_duplicate = "DUPLICATE" in result.upper()
-        return is_duplicate
+        similarities = (embed_headlines(headlines) @ self.sent_headline_embeddings.T).max(axis=1)
+        verdicts = []
+        for headline, similarity in zip(headlines, similarities):
+            if _normalize_headline(headline) in self.sent_normalized_headlines:
+                verdicts.append(True)
+            elif similarity < HEADLINE_UNIQUE_SIMILARITY:
+                verdicts.append(False)
+            else:
+                # Headlines judged duplicates in earlier runs stay duplicates, since the sent
+                # list only grows; unique verdicts aren't cached as they can go stale
+                verdicts.append(True if extraction_cache.get(_duplicate_cache_key(headline)) is not None else None)
+        logger.info(f"Local duplicate check: {verdicts.count(True)} duplicates, {verdicts.count(None)} borderline headlines for the AI model")
+        return verdicts
     
-    async def _qualify_news_content(self, news: ContractNews) -> Dict[str, Any]:
+    async def _qualify_news_content(self, news: ContractNews, sent_headlines: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Qualify news content using AI.
         
         Args:
             news: The news item to qualify
+            sent_headlines: Previously sent headlines to check the item against in the same call;
+                the result then also has a "duplicate" verdict
             
         Returns:
             Dictionary with qualification results
         """
         prompt = f"""
-You are a Steel Sales Lead Qualification System for a steel manufacturing company. Your task is to:
-1. Identify the industry and sub-category of the project
-2. Determine if the news article about a contract award or project is worth sending to our sales team for potential steel sales
-
-You need to evaluate this news to determine:
-1. Whether the project would require significant steel materials
-2. Whether we could potentially sell steel to the company mentioned in the news (not to the government)
-3. The specific potential steel requirements (types, quantities if mentioned)
-4. The urgency/timeline of the opportunity
-
-
-### ALLOWED TAGS:
-- `Automotive-Confirmed`  
-- `Automotive-Predictive_Alert`  
-- `Infrastructure-Contract_Won`  
-- `Infrastructure-Ongoing_Tender`  
-- `Realty-Announced`  
-- `Realty-Predictive_Alert`  
-- `Renewable_Energy-Contract_Won`  
-- `Renewable_Energy-Ongoing_Tender`  
-- `Renewable_Energy-Predictive_Alert` 
-
-
 News article details:
 Title: {news.title}
 Company: {news.company}
@@ -182,206 +440,367 @@ Location: {news.location}
 Contract Value: {news.contract_value}
 Date: {news.date_published}
 Description: {news.description}
-
-Here are important criteria:
-- First identify the industry and sub-category from the options above
-- Government entities are **not** direct targets for steel sales
-- Small-scale IT or service contracts typically don't require significant steel
-- Construction, infrastructure, manufacturing, energy projects often need substantial steel
-- The contract value should be significant enough to indicate large material requirements
-- We want to focus on opportunities where the company (not the government) would be purchasing steel
-
-Provide your analysis in the following JSON format only:
-{{
-    "qualified": true/false,
-    "tag": "Industry-SubCategory",  # MUST MATCH ALLOWED TAGS ABOVE
-    "sub_category": "Specific sub-category from the provided options",
-    "steel_requirements": "Detailed description of likely steel requirements",
-    "potential_value": "Estimated percentage of the contract value that might be spent on steel",
-    "target_company": "The specific company that would potentially purchase the steel",
-    "urgency": "high/medium/low",
-    "reasoning": "Your detailed reasoning including industry classification justification"
-}}
-
-Response MUST be valid JSON.
 """
-        result = await self._call_ai_model(prompt)
+        if sent_headlines:
+            prompt += "\nPreviously sent headlines:\n" + "\n".join(f"- {headline}" for headline in sent_headlines) + "\n"
+        # The prompts hold every input, so identical prompts to the same model have already been
+        # answered; only answers from the model that would be asked first are reused, so a
+        # fallback model's verdicts stop being used once the preferred model is back
+        def cache_key(model: str) -> str:
+            return extraction_cache.make_key("qualification", model, QUALIFICATION_SYSTEM_PROMPT, prompt)
+        
+        cached = extraction_cache.get(cache_key(self._preferred_model(json_mode=True)))
+        if cached:
+            logger.info(f"Using cached qualification for: {news.title}")
+            return cached[0]
+        
+        model, result = await self._call_ai_model(prompt, system=QUALIFICATION_SYSTEM_PROMPT, json_mode=True)
         
         # Extract JSON from the response
         try:
-            # Find JSON in the response using simple heuristic
-            start_idx = result.find('{')
-            end_idx = result.rfind('}') + 1
-            if start_idx >= 0 and end_idx > start_idx:
-                json_str = result[start_idx:end_idx]
-                return json.loads(json_str)
-            else:
-                return {"qualified": False, "reasoning": "Failed to parse AI model response"}
-        except (json.JSONDecodeError, ValueError) as e:
-            print(f"Error parsing qualification result: {e}")
+            try:
+                # JSON mode responses are the object itself
+                qualification = Qualification.model_validate_json(result).model_dump()
+            except ValueError:
+                # Models without JSON mode may wrap the object in prose or code fences
+                start_idx = result.find('{')
+                end_idx = result.rfind('}') + 1
+                if start_idx < 0 or end_idx <= start_idx:
+                    return {"qualified": False, "reasoning": "Failed to parse AI model response"}
+                qualification = Qualification.model_validate_json(result[start_idx:end_idx]).model_dump()
+            # Only parsed answers are cached, so failed calls are retried next run
+            extraction_cache.set(cache_key(model), [qualification], task="qualification", model=model)
+            return qualification
+        except ValueError as e:
+            logger.error(f"Error parsing qualification result: {e}")
             return {"qualified": False, "reasoning": f"Failed to parse AI model response: {str(e)}"}
     
-    async def _call_ai_model(self, prompt: str) -> str:
-        """Call AI models with fallback logic."""
+    async def _session(self) -> aiohttp.ClientSession:
+        """Return the pooled HTTP session for direct API calls, creating it on first use."""
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=64, limit_per_host=16),
+                timeout=DIRECT_API_TIMEOUT
+            )
+        return self._http
+    
+    async def aclose(self):
+        """Close the HTTP session for direct API calls, if one was opened."""
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
+    
+    async def _call_with_retry(self, provider: str, call) -> Any:
+        """
+        Await call() within the provider's concurrency limit, retrying transient failures.
+        
+        Rate limits and 5xx responses are retried after the provider's Retry-After delay,
+        or an exponential backoff with jitter; any other error is raised straight away.
+        """
+        async with self._provider_semaphores[provider]:
+            for attempt in range(AI_CALL_RETRIES + 1):
+                try:
+                    return await call()
+                except Exception as e:
+                    transient = _error_status(e) in RETRY_STATUS_CODES or isinstance(e, (asyncio.TimeoutError, aiohttp.ClientConnectionError))
+                    if not transient or attempt == AI_CALL_RETRIES:
+                        raise
+                    delay = _retry_after(e) or min(2 ** attempt + random.random(), AI_CALL_MAX_BACKOFF)
+                    logger.warning(f"Transient {provider} error, retrying in {delay:.1f}s: {e}")
+                    await asyncio.sleep(delay)
+    
+    def _preferred_model(self, json_mode: bool = False) -> str:
+        """Return the identifier of the model _call_ai_model tries first."""
+        if self.deepseek:
+            return f"deepseek/{DEEPSEEK_MODEL}"
+        if self.gemini:
+            return f"gemini/{GEMINI_MODEL}" + ("/json" if json_mode else "")
+        if self.deepseek_api_key:
+            return f"deepseek/{DEEPSEEK_MODEL}"
+        return f"gemini/{GEMINI_DIRECT_MODEL}"
+    
+    async def _call_ai_model(self, prompt: str, system: Optional[str] = None, json_mode: bool = False) -> Tuple[str, str]:
+        """
+        Call AI models with fallback logic.
+        
+        Args:
+            prompt: The user message
+            system: Optional system message; kept identical across calls so providers can reuse the cached prefix
+            json_mode: Ask for a single JSON object, on the providers that can enforce it
+            
+        Returns:
+            Identifier of the model that answered (as from _preferred_model) and the text of its response
+        """
+        from langchain.schema import HumanMessage, SystemMessage
+        messages = ([SystemMessage(content=system)] if system else []) + [HumanMessage(content=prompt)]
+        
         # Try DeepSeek first if available
         if self.deepseek:
             try:
-                print("Trying DeepSeek model...")
-                response = await self.deepseek.ainvoke(prompt)
-                return response.content
+                logger.info("Trying DeepSeek model...")
+                response = await self._call_with_retry("deepseek", lambda: self.deepseek.ainvoke(messages))
+                return f"deepseek/{DEEPSEEK_MODEL}", response.content
             except Exception as e:
-                print(f"Error calling DeepSeek API: {e}")
+                logger.error(f"Error calling DeepSeek API: {e}")
                 # Fall through to next model
         
         # Try Gemini if available
         if self.gemini:
             try:
-                print("Trying Gemini model...")
-                from langchain.schema import HumanMessage
-                response = await self.gemini.ainvoke([HumanMessage(content=prompt)])
-                return response.content
+                logger.info("Trying Gemini model...")
+                gemini = self.gemini_json if json_mode else self.gemini
+                response = await self._call_with_retry("gemini", lambda: gemini.ainvoke(messages))
+                return f"gemini/{GEMINI_MODEL}" + ("/json" if json_mode else ""), response.content
             except Exception as e:
-                print(f"Error calling Gemini API: {e}")
+                logger.error(f"Error calling Gemini API: {e}")
                 # Fall through to direct API calls
         
         # Direct API calls as last resort
         # Try DeepSeek direct API
         if self.deepseek_api_key:
             try:
-                import requests
-                print("Trying DeepSeek direct API call...")
+                logger.info("Trying DeepSeek direct API call...")
                 headers = {
                     "Authorization": f"Bearer {self.deepseek_api_key}",
                     "Content-Type": "application/json"
                 }
                 payload = {
-                    "model": "deepseek-reasoner",
-                    "messages": [{"role": "user", "content": prompt}],
+                    "model": DEEPSEEK_MODEL,
+                    "messages": ([{"role": "system", "content": system}] if system else []) + [{"role": "user", "content": prompt}],
                     "temperature": 0.1
                 }
-                response = requests.post(
-                    "https://api.deepseek.com/v1/chat/completions", 
-                    headers=headers, 
-                    json=payload
-                )
-                response.raise_for_status()
-                return response.json()["choices"][0]["message"]["content"]
+                session = await self._session()
+                
+                async def post():
+                    async with session.post(DEEPSEEK_API_URL, headers=headers, json=payload) as response:
+                        response.raise_for_status()
+                        return await response.json()
+                
+                data = await self._call_with_retry("deepseek", post)
+                return f"deepseek/{DEEPSEEK_MODEL}", data["choices"][0]["message"]["content"]
             except Exception as e:
-                print(f"Error calling DeepSeek API directly: {e}")
+                logger.error(f"Error calling DeepSeek API directly: {e}")
         
         # Try Gemini direct API
         if self.gemini_api_key:
             try:
                 import google.generativeai as genai
-                print("Trying Gemini direct API call...")
+                logger.info("Trying Gemini direct API call...")
                 genai.configure(api_key=self.gemini_api_key)
-                model = genai.GenerativeModel('gemini-pro')
-                response = model.generate_content(prompt)
-                return response.text
+                model = genai.GenerativeModel(GEMINI_DIRECT_MODEL)
+                # The SDK call blocks, so keep it off the event loop
+                # gemini-pro takes no system instruction, so send it ahead of the prompt
+                contents = f"{system}\n\n{prompt}" if system else prompt
+                response = await self._call_with_retry("gemini", lambda: asyncio.to_thread(model.generate_content, contents))
+                return f"gemini/{GEMINI_DIRECT_MODEL}", response.text
             except Exception as e:
-                print(f"Error calling Gemini API directly: {e}")
+                logger.error(f"Error calling Gemini API directly: {e}")
         
         # If all else fails
         raise Exception("All AI model calls failed")
     
-    async def process_news(self, news_items: List[ContractNews]) -> List[Dict[str, Any]]:
+    async def _process_one(self, news: ContractNews, index: int, borderline: bool = False) -> Optional[Dict[str, Any]]:
+        """Qualify one news item, checking borderline headlines for duplicates in the same call; return it if it qualifies."""
+        logger.info(f"[{index}] Processing: {news.title}")
+        
+        try:
+            # Task 2: Qualify news content, unless the keyword prefilter already rules the item out
+            rejection = prefilter_rejection(news)
+            if rejection:
+                self.prefiltered += 1
+                self.processed_keys.append(seen_news_key(news))
+                logger.info(f"  [{index}] ❌ News not qualified: {rejection}")
+                return None
+            if borderline:
+                # The same call decides whether a borderline headline is a duplicate
+                qualification = await self._qualify_news_content(news, self._similar_sent_headlines(news.title))
+                if qualification.get("duplicate"):
+                    extraction_cache.set(_duplicate_cache_key(news.title), [], task="headline_duplicate")
+                    self.processed_keys.append(seen_news_key(news))
+                    logger.info(f"  [{index}] ❌ Headline is a duplicate, skipping: {news.title}")
+                    return None
+            else:
+                qualification = await self._qualify_news_content(news)
+            is_qualified = qualification.get("qualified", False)
+            self.processed_keys.append(seen_news_key(news))
+            
+            if is_qualified:
+                logger.info(f"  [{index}] ✓ News qualified: {qualification.get('reasoning', '')[:100]}...")
+                # Create a dictionary with both news and qualification data
+                qualified_item = {
+                    "news": news,
+                    "qualification": qualification
+                }
+                await self._save_qualified_news(qualified_item)
+                return qualified_item
+            logger.info(f"  [{index}] ❌ News not qualified: {qualification.get('reasoning', '')[:100]}...")
+        except Exception as e:
+            logger.error(f"  [{index}] ❌ Error processing news: {str(e)}")
+        return None
+    
+    async def process_news(self, news_items: Iterable[ContractNews]) -> List[Dict[str, Any]]:
         """
-        Process a list of news items through the AI pipeline.
+        Process news items through the AI pipeline as they are read.
+        
+        Items are deduplicated a batch at a time and the unique ones are queued for a
+        fixed pool of workers, so only a bounded number of items is held in memory.
         
         Args:
-            news_items: List of news items to process
+            news_items: News items to process; may be a lazy iterator such as read_news_csv
             
         Returns:
-            List of dictionaries containing both news items and their qualifications
+            List of dictionaries containing both news items and their qualifications, in input order
         """
-        qualified_news = []
-        newly_sent_headlines = []
+        logger.info("Processing news items through the AI pipeline...")
         
-        print(f"\nProcessing {len(news_items)} news items through the AI pipeline...\n")
+        work_queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        qualified = []
+        total = 0
+        self.prefiltered = 0
+        # seen_news_key of each item settled this run, recorded for the crawler at the end
+        self.processed_keys = []
         
-        for i, news in enumerate(news_items, 1):
-            print(f"[{i}/{len(news_items)}] Processing: {news.title}")
-            
+        async def feed():
+            nonlocal total
+            items = iter(news_items)
             try:
-                # Task 1: Check for headline duplication
-                is_duplicate = await self._check_headline_duplicate(news.title)
-                if is_duplicate:
-                    print(f"  ❌ Headline is a duplicate, skipping")
-                    continue
-                
-                # Task 2: Qualify news content
-                qualification = await self._qualify_news_content(news)
-                is_qualified = qualification.get("qualified", False)
-                
-                if is_qualified:
-                    print(f"  ✓ News qualified: {qualification.get('reasoning', '')[:100]}...")
-                    # Create a dictionary with both news and qualification data
-                    qualified_item = {
-                        "news": news,
-                        "qualification": qualification
-                    }
-                    qualified_news.append(qualified_item)
-                    newly_sent_headlines.append(news.title)
-                else:
-                    print(f"  ❌ News not qualified: {qualification.get('reasoning', '')[:100]}...")
+                while batch := list(itertools.islice(items, HEADLINE_BATCH_SIZE)):
+                    # Task 1: Check the batch's headlines for duplicates; borderline ones are
+                    # left for the AI model to decide while qualifying them
+                    is_duplicate = self._find_duplicate_headlines([news.title for news in batch])
+                    for news, duplicate in zip(batch, is_duplicate):
+                        total += 1
+                        if duplicate:
+                            self.processed_keys.append(seen_news_key(news))
+                            logger.info(f"  [{total}] ❌ Headline is a duplicate, skipping: {news.title}")
+                        else:
+                            await work_queue.put((total, news, duplicate is None))
             except Exception as e:
-                print(f"  ❌ Error processing news: {str(e)}")
+                logger.error(f"Error reading news items: {e}")
+            finally:
+                # One stop marker per worker
+                for _ in range(PIPELINE_CONCURRENCY):
+                    await work_queue.put(None)
+        
+        async def work():
+            while (entry := await work_queue.get()) is not None:
+                index, news, borderline = entry
+                qualified_item = await self._process_one(news, index, borderline)
+                if qualified_item is not None:
+                    qualified.append((index, qualified_item))
+        
+        # Qualified items are queued for a single writer task that appends them to the CSV,
+        # and their headlines to the sent headlines file, in batches
+        self._qualified_news_queue = asyncio.Queue(maxsize=QUALIFIED_NEWS_QUEUE_SIZE)
+        writer = asyncio.create_task(self._write_qualified_news())
+        processing = asyncio.ensure_future(asyncio.gather(feed(), *(work() for _ in range(PIPELINE_CONCURRENCY))))
+        try:
+            await asyncio.wait({processing, writer}, return_when=asyncio.FIRST_COMPLETED)
+            if writer.done():
+                # The writer only returns after the stop marker, so it failed; stop the workers
+                # rather than let them qualify items that can't be saved
+                processing.cancel()
+                await asyncio.gather(processing, return_exceptions=True)
+                writer.result()
+            processing.result()
+        finally:
+            # If this run was cancelled, stop the workers before the writer drains the queue
+            if not processing.done():
+                processing.cancel()
+                await asyncio.gather(processing, return_exceptions=True)
+            if not writer.done():
+                await self._qualified_news_queue.put(None)
+                await writer
+        qualified_news = [item for _, item in sorted(qualified, key=lambda entry: entry[0])]
+        newly_sent_headlines = [item["news"].title for item in qualified_news]
         
         # Update sent headlines list
         if newly_sent_headlines:
             self.sent_headlines.extend(newly_sent_headlines)
-            self._save_sent_headlines()
-            
-            # Save qualified news to CSV
-            self._save_qualified_news(qualified_news)
+            self.sent_normalized_headlines.update(_normalize_headline(headline) for headline in newly_sent_headlines)
+            self.sent_headline_embeddings = np.vstack([self.sent_headline_embeddings, embed_headlines(newly_sent_headlines)])
+            logger.info(f"Saved {len(qualified_news)} qualified news items to {self.qualified_news_file}")
+        
+        # Items whose qualification failed aren't marked, so the next crawl offers them again
+        mark_news_seen(self.processed_keys)
         
-        print(f"\nAI pipeline completed: {len(qualified_news)}/{len(news_items)} news qualified\n")
+        logger.info(f"Prefilter rejected {self.prefiltered}/{total} news items without an AI call")
+        logger.info(f"AI pipeline completed: {len(qualified_news)}/{total} news qualified")
         return qualified_news
     
-    def _save_qualified_news(self, news_items: List[Dict[str, Any]]):
-        """Save qualified news to a CSV file."""
-        if not news_items:
-            return
+    async def _write_qualified_news(self):
+        """
+        Append queued qualified rows to the CSV a batch at a time, until the stop marker.
         
-        with open(self.qualified_news_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
+        Each batch's headlines are appended to the sent headlines file right after its rows,
+        so a run that stops part way never leaves rows in the CSV whose headlines weren't recorded.
+        """
+        is_new = not os.path.exists(self.qualified_news_file) or os.path.getsize(self.qualified_news_file) == 0
+        async with aiofiles.open(self.qualified_news_file, 'a', newline='', encoding='utf-8', buffering=QUALIFIED_NEWS_BUFFER_SIZE) as f, \
+                aiofiles.open(self.headlines_file, 'ab') as headlines_f:
+            if is_new:
+                await f.write(_csv_text([QUALIFIED_NEWS_HEADER]))
+                await f.flush()
             
-            # Write header
-            writer.writerow([
-                "Title", 
-                "Company", 
-                "Project Type", 
-                "Location", 
-                "Contract Value", 
-                "Date Published", 
-                 "Tag",  # Combined Industry-SubCategory
-                "Steel Requirements",
-                "Potential Value",
-                "Target Company",
-                "Urgency",
-                "Reasoning"
-            ])
+            async def write_batch(batch):
+                await f.write(_csv_text([row for row, _ in batch]))
+                await f.flush()
+                await headlines_f.write(_headline_lines([headline for _, headline in batch]))
+                await headlines_f.flush()
             
-            # Write data
-            for item in news_items:
-                news = item["news"]
-                qualification = item["qualification"]
-                writer.writerow([
-                    news.title,
-                    news.company,
-                    news.project_type,
-                    news.location,
-                    news.contract_value,
-                    news.date_published,
-                    qualification.get("tag", ""),  # e.g., "Automotive-Confirmed"
-                    qualification.get("steel_requirements", ""),
-                    qualification.get("potential_value", ""),
-                    qualification.get("target_company", ""),
-                    qualification.get("urgency", ""),
-                    qualification.get("reasoning", "")
-                ])
-        
-        print(f"Saved {len(news_items)} qualified news items to {self.qualified_news_file}")
+            batch = []
+            while (entry := await self._qualified_news_queue.get()) is not None:
+                batch.append(entry)
+                if len(batch) >= QUALIFIED_NEWS_WRITE_BATCH:
+                    await write_batch(batch)
+                    batch = []
+            if batch:
+                await write_batch(batch)
+    
+    async def _save_qualified_news(self, item: Dict[str, Any]):
+        """Queue one qualified news item, with its headline, for the writer task."""
+        news = item["news"]
+        qualification = item["qualification"]
+        row = [
+            news.title,
+            news.company,
+            news.project_type,
+            news.location,
+            news.contract_value,
+            news.date_published,
+            qualification.get("tag", ""),  # e.g., "Automotive-Confirmed"
+            qualification.get("steel_requirements", ""),
+            qualification.get("potential_value", ""),
+            qualification.get("target_company", ""),
+            qualification.get("urgency", ""),
+            qualification.get("reasoning", "")
+        ]
+        await self._qualified_news_queue.put((row, news.title))
+
+def _headline_lines(headlines: List[str]) -> bytes:
+    """Encode headlines as JSON Lines."""
+    return b"".join(orjson.dumps(headline) + b"\n" for headline in headlines)
+
+def _csv_text(rows: List[List[Any]]) -> str:
+    """Format rows as CSV text, so it can be written to an async file in one call."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+def read_news_csv(filename: str) -> Iterator[ContractNews]:
+    """Yield the news items of a contract news CSV one row at a time."""
+    with open(filename, 'r', newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            yield ContractNews(
+                title=row["Title"],
+                company=row["Company"],
+                project_type=row["Project Type"],
+                location=row["Location"],
+                contract_value=row["Contract Value"],
+                date_published=row["Date Published"],
+                source_url=row["Source URL"],
+                description=row["Description"]
+            )
 
 async def main():
     """Main function to run the AI pipeline."""
@@ -390,35 +809,24 @@ async def main():
         # Step 1: Run the crawler to get news
         await crawl_main()
         
-        # Step 2: Load the scraped news
-        from crawl4ai_agent import ContractNews
-        news_items = []
-        
+        # Step 2: Stream the scraped news; rows are read as the pipeline has room for them
+        news_items = read_news_csv("contract_news.csv")
         try:
-            with open("contract_news.csv", 'r', newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    news_items.append(ContractNews(
-                        title=row["Title"],
-                        company=row["Company"],
-                        project_type=row["Project Type"],
-                        location=row["Location"],
-                        contract_value=row["Contract Value"],
-                        date_published=row["Date Published"],
-                        source_url=row["Source URL"],
-                        description=row["Description"]
-                    ))
+            first_item = next(news_items, None)
         except Exception as e:
-            print(f"Error loading news from CSV: {e}")
+            logger.error(f"Error loading news from CSV: {e}")
             return
         
-        if not news_items:
-            print("No news items found")
+        if first_item is None:
+            logger.info("No news items found")
             return
         
         # Step 3: Process through AI pipeline
         pipeline = NewsQualificationPipeline()
-        qualified_news = await pipeline.process_news(news_items)
+        try:
+            qualified_news = await pipeline.process_news(itertools.chain([first_item], news_items))
+        finally:
+            await pipeline.aclose()
         
         # Step 4: Display results
         print("\n===== QUALIFIED STEEL CONTRACT NEWS =====\n")
@@ -437,7 +845,7 @@ async def main():
             print()
     
     except Exception as e:
-        print(f"Error running AI pipeline: {e}")
+        logger.error(f"Error running AI pipeline: {e}")
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,70 @@
+"""
+Extraction Cache - A content-addressable on-disk cache for LLM results: the crawler's
+news extractions and the qualification pipeline's verdicts.
+
+Each entry is a JSON file named by a SHA-256 key over everything that went into
+the prompt (provider, model, prompt version and the prompt inputs), so a changed
+page, prompt or model simply misses instead of returning stale results.
+"""
+import hashlib
+import os
+from datetime import datetime, timezone
+from typing import List, Optional, Dict, Any
+
+import orjson
+
+# Directory holding one <key>.json file per cached extraction
+CACHE_DIR = "extraction_cache"
+
+def make_key(*fields: str) -> str:
+    """Hash the given fields into a cache key."""
+    digest = hashlib.sha256()
+    for field in fields:
+        data = field.encode("utf-8")
+        # Length-prefix each field so different field splits can never hash the same
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
+
+def _entry_path(key: str) -> str:
+    return os.path.join(CACHE_DIR, f"{key}.json")
+
+def get(key: str) -> Optional[List[Dict[str, Any]]]:
+    """Return the cached items for a key, or None on a miss or a corrupt entry."""
+    try:
+        with open(_entry_path(key), "rb") as f:
+            entry = orjson.loads(f.read())
+        items = entry["items"]
+        if not isinstance(items, list):
+            raise ValueError("items is not a list")
+        return items
+    except FileNotFoundError:
+        return None
+    except (ValueError, KeyError, TypeError) as e:
+        print(f"Discarding extraction cache entry {key}: {str(e)}")
+        evict(key)
+        return None
+
+def set(key: str, items: List[Dict[str, Any]], **metadata: str):
+    """Store items under a key atomically, along with a UTC timestamp and any metadata."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    entry = {
+        "cached_at": datetime.now(timezone.utc).isoformat(),
+        **metadata,
+        "items": items
+    }
+    path = _entry_path(key)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(entry))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Could not write extraction cache entry {key}: {str(e)}")
+
+def evict(key: str):
+    """Remove a cache entry if it exists."""
+    try:
+        os.remove(_entry_path(key))
+    except OSError:
+        pass
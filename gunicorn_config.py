@@ -0,0 +1,16 @@
+"""Gunicorn settings for serving the Flask app in production."""
+
+import os
+
+# Bind to the port provided by the platform (Render sets PORT)
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+# Threaded workers: requests are short CSV/JSON reads, and unlike gevent this
+# doesn't monkey-patch the watchdog observer thread or the pipeline subprocess
+workers = int(os.environ.get('WEB_CONCURRENCY', 4))
+worker_class = 'gthread'
+threads = 8
+
+# Reuse client connections between dashboard polls
+keepalive = 30
+timeout = 60
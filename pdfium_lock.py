@@ -0,0 +1,10 @@
+"""
+PDFium Lock - The process-wide lock for every pypdfium2 call.
+
+PDFium is not thread-safe, even when each thread has its own document, and both
+BSE scrapers can run in the same process at once (crawl4ai_agent runs them in
+worker threads), so they share this one lock rather than keeping one each.
+"""
+import threading
+
+PDFIUM_LOCK = threading.Lock()